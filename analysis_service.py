@@ -0,0 +1,410 @@
+"""
+Skill Gap AI - local HTTP analysis service.
+
+Exposes the analysis pipeline as JSON over HTTP for other internal systems:
+
+    python analysis_service.py --port 8765 --workers 4
+
+    GET  /health    pool size and current load
+    POST /jd        precompile a JD once -> {"jd_id", "skills"}
+    POST /analyze   one resume against a JD (inline or by jd_id)
+    POST /batch     many resumes against one JD
+
+Documents are sent either as text ("resume_text" / "jd_text") or as base64
+file bytes ("resume" / "jd", with an optional "resume_type" / "jd_type"
+MIME type; sniffed when missing). A JD can be replaced by the "jd_id"
+returned from /jd. /batch takes {"resumes": [{"id", "text" | "data",
+"type"}...]} plus the JD. Results carry "truncated": true when a PDF hit
+the reading time budget; such a JD gets no jd_id and is never cached.
+
+An asyncio front end (standard library only) accepts connections, and all
+parsing and matching runs in a bounded process pool. At most
+workers * QUEUE_FACTOR jobs may be queued or running; beyond that requests
+are refused straight away with 429 and Retry-After. A request that isn't
+answered within --timeout seconds gets 504. Its slot is only freed once the
+worker actually finishes, so the limit always reflects real pool load.
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import skill_analysis
+import text_extraction
+import jd_profile
+from jd_profile import cached_profile
+from skill_analysis import TXT_TYPE, content_hash, parse_document
+
+QUEUE_FACTOR = 4            # admitted jobs per worker before answering 429
+REQUEST_TIMEOUT = 30.0      # seconds
+MAX_BODY_BYTES = 32 * 1024 * 1024
+MAX_BATCH = 500             # resumes per /batch request
+MAX_JD_PROFILES = 1024      # precompiled JDs kept in memory
+BATCH_CHUNK = 16            # minimum resumes per pool task inside a batch
+
+class RequestError(Exception):
+    """Turned into a JSON error response with the given status"""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+# ================= WORKER SIDE =================
+
+_profile_dir = jd_profile.PROFILE_DIR
+
+def _init_worker(use_store):
+    global _profile_dir
+    skill_analysis.reset_document_store()  # open our own, not the parent's
+    if not use_store:
+        skill_analysis.STORE_PATH = ""
+        _profile_dir = None
+    text_extraction.use_single_page_worker()
+
+def _skill_names(doc):
+    return sorted({s["name"].lower() for s in doc.skills})
+
+def parse_jd_job(data, file_type):
+    """JD bytes -> JDProfile (raises ValueError when unreadable)"""
+    return cached_profile(data, file_type, _profile_dir)
+
+def score_job(data, file_type, profile):
+    """One resume against a precompiled JD profile, as a JSON-ready dict"""
+    doc = parse_document(data, file_type)
+    if doc.error:
+        return {"error": f"could not read resume: {doc.error}"}
+
+    names = frozenset(_skill_names(doc))
+    return {
+        "candidate": doc.name,
+        "linkedin": doc.linkedin,
+        "email": doc.email,
+        "phone": doc.phone,
+        "github": doc.github,
+        "resume_skills": sorted(names),
+        "truncated": doc.truncated,
+        **profile.gap(names),
+    }
+
+def batch_job(resumes, profile):
+    """[(id, data, type)] -> [result dicts with "id"], one pool task per chunk"""
+    return [{"id": rid, **score_job(data, file_type, profile)} for rid, data, file_type in resumes]
+
+# ================= SERVICE =================
+
+class AnalysisService:
+    """Admission control, JD profiles and dispatch to the process pool"""
+
+    def __init__(self, workers, timeout=REQUEST_TIMEOUT, queue_factor=QUEUE_FACTOR, use_store=True):
+        self.workers = workers
+        self.timeout = timeout
+        self.capacity = workers * queue_factor
+        self.pending = 0
+        self.jd_profiles = {}   # jd_id -> JDProfile (insertion-ordered for eviction)
+        self.stats = {"requests": 0, "rejected": 0, "timeouts": 0}
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_store,))
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def _release(self, slots=1):
+        self.pending -= slots
+
+    def _reserve(self, slots=1):
+        """Take `slots` pool slots at once, or 429 straight away when they aren't all free"""
+        if self.pending + slots > self.capacity:
+            self.stats["rejected"] += 1
+            raise RequestError(HTTPStatus.TOO_MANY_REQUESTS, "analysis queue is full, retry later",
+                               {"Retry-After": "1"})
+        self.pending += slots
+
+    def _start(self, fn, *args):
+        """Run fn(*args) in the pool on a slot already reserved; returns an asyncio future"""
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.pool.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is freed (on the loop thread) once the worker is really
+        # done, even if the request already timed out
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return asyncio.wrap_future(future)
+
+    async def submit(self, fn, *args):
+        """Run fn(*args) in the pool; 429 straight away when the pool is saturated"""
+        self._reserve()
+        return await self._start(fn, *args)
+
+    async def run(self, coro):
+        """Apply the per-request timeout"""
+        try:
+            return await asyncio.wait_for(coro, self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise RequestError(HTTPStatus.GATEWAY_TIMEOUT, f"analysis took longer than {self.timeout:g}s")
+
+    # ----- request bodies -----
+
+    @staticmethod
+    def _document(body, name):
+        """(bytes, MIME type or None) for `name`_text / base64 `name`"""
+        text = body.get(f"{name}_text")
+        if text is not None:
+            if not isinstance(text, str):
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"{name}_text must be a string")
+            return text.encode("utf-8"), TXT_TYPE
+        encoded = body.get(name)
+        if encoded is None:
+            return None, None
+        try:
+            return base64.b64decode(encoded, validate=True), body.get(f"{name}_type")
+        except (binascii.Error, TypeError, ValueError):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"{name} must be base64-encoded file bytes")
+
+    def _jd_profile(self, body):
+        jd_id = body.get("jd_id")
+        if jd_id is None:
+            return None
+        profile = self.jd_profiles.get(jd_id)
+        if profile is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"unknown jd_id {jd_id!r}; POST the JD to /jd first")
+        return profile
+
+    async def _resolve_jd(self, body):
+        profile = self._jd_profile(body)
+        if profile is not None:
+            return profile
+        data, file_type = self._document(body, "jd")
+        if data is None:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "send jd_text, jd (base64) or jd_id")
+        return await self._precompile(data, file_type)
+
+    async def _precompile(self, data, file_type):
+        jd_id = content_hash(data)[:32]
+        profile = self.jd_profiles.get(jd_id)
+        if profile is None:
+            try:
+                profile = await self.submit(parse_jd_job, data, file_type)
+            except ValueError as e:
+                raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+            if profile.truncated:
+                return profile  # partial read: the next request reads it again
+            if len(self.jd_profiles) >= MAX_JD_PROFILES:
+                self.jd_profiles.pop(next(iter(self.jd_profiles)))
+            self.jd_profiles[jd_id] = profile
+        return profile
+
+    # ----- endpoints -----
+
+    async def health(self, body):
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "jd_profiles": len(self.jd_profiles),
+            **self.stats,
+        }
+
+    async def precompile_jd(self, body):
+        data, file_type = self._document(body, "jd")
+        if data is None:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "send jd_text or jd (base64)")
+        profile = await self.run(self._precompile(data, file_type))
+        if profile.truncated:
+            # Not registered: a jd_id would pin the partial read
+            return {"jd_id": None, "skills": list(profile.skills), "truncated": True}
+        return {"jd_id": content_hash(data)[:32], "skills": list(profile.skills)}
+
+    async def analyze(self, body):
+        data, file_type = self._document(body, "resume")
+        if data is None:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "send resume_text or resume (base64)")
+
+        async def work():
+            # Inline JDs are compiled once too and reused by later requests
+            profile = await self._resolve_jd(body)
+            return await self.submit(score_job, data, file_type, profile)
+
+        result = await self.run(work())
+        if "error" in result:
+            raise RequestError(HTTPStatus.UNPROCESSABLE_ENTITY, result["error"])
+        return result
+
+    async def batch(self, body):
+        resumes = body.get("resumes")
+        if not isinstance(resumes, list) or not resumes:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "resumes must be a non-empty list")
+        if len(resumes) > MAX_BATCH:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"at most {MAX_BATCH} resumes per batch")
+
+        items = []
+        for i, entry in enumerate(resumes):
+            if not isinstance(entry, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST, "each resume must be an object")
+            doc = {"resume_text": entry.get("text"), "resume": entry.get("data"),
+                   "resume_type": entry.get("type")}
+            data, file_type = self._document({k: v for k, v in doc.items() if v is not None}, "resume")
+            if data is None:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"resume {i} needs text or data")
+            items.append((entry.get("id", i), data, file_type))
+
+        async def work():
+            profile = await self._resolve_jd(body)
+            # At most one chunk per worker, so any batch fits in the queue
+            size = max(BATCH_CHUNK, -(-len(items) // self.workers))
+            chunks = [items[i:i + size] for i in range(0, len(items), size)]
+            # Admit the whole batch or none of it, so a batch never half-runs:
+            # every slot is reserved, and every chunk submitted, before any
+            # other request gets to run
+            self._reserve(len(chunks))
+            futures = []
+            for i, chunk in enumerate(chunks):
+                try:
+                    futures.append(self._start(batch_job, chunk, profile))
+                except BaseException:
+                    self._release(len(chunks) - i - 1)  # _start freed its own slot
+                    raise
+            parts = await asyncio.gather(*futures)
+            return [result for part in parts for result in part]
+
+        return {"results": await self.run(work())}
+
+    ROUTES = {
+        ("GET", "/health"): "health",
+        ("POST", "/jd"): "precompile_jd",
+        ("POST", "/analyze"): "analyze",
+        ("POST", "/batch"): "batch",
+    }
+
+    async def dispatch(self, method, path, body):
+        handler = self.ROUTES.get((method, path.split("?", 1)[0]))
+        if handler is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"no route for {method} {path}")
+        self.stats["requests"] += 1
+        return await getattr(self, handler)(body)
+
+# ================= HTTP FRONT END =================
+
+async def _read_request(reader):
+    """(method, path, headers, body bytes), or None when the client hung up"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise RequestError(HTTPStatus.LENGTH_REQUIRED, "chunked bodies are not supported")
+    length = headers.get("content-length") or "0"
+    if not (length.isascii() and length.isdigit()):
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"invalid Content-Length {length!r}")
+    length = int(length)
+    if length > MAX_BODY_BYTES:
+        raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+def _response(status, payload, headers=None, keep_alive=True):
+    body = json.dumps(payload).encode("utf-8")
+    status = HTTPStatus(status)
+    lines = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            keep_alive, request = True, None
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, raw = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    raise RequestError(HTTPStatus.BAD_REQUEST, "body must be JSON")
+                if not isinstance(body, dict):
+                    raise RequestError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+                response = _response(HTTPStatus.OK, await service.dispatch(method, path, body),
+                                     keep_alive=keep_alive)
+            except RequestError as e:
+                # A request that couldn't be read leaves its body unread: close
+                keep_alive = keep_alive and request is not None
+                response = _response(e.status, {"error": str(e)}, e.headers, keep_alive)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as e:
+                response = _response(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                     {"error": f"{type(e).__name__}: {e}"}, keep_alive=keep_alive)
+
+            writer.write(response)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(host, port, workers, timeout, use_store):
+    service = AnalysisService(workers, timeout, use_store=use_store)
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), host, port
+    )
+    print(f"skill gap service on http://{host}:{port} ({workers} workers, "
+          f"{service.capacity} queued jobs max, {timeout:g}s timeout)", file=sys.stderr, flush=True)
+    # SIGTERM / Ctrl-C: stop accepting, then shut the pool down properly so
+    # no worker processes are left behind
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl-C still raises KeyboardInterrupt
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP service for skill gap analysis")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="seconds per request")
+    parser.add_argument("--no-store", action="store_true", help="don't use the parsed-document store")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, max(1, args.workers), args.timeout, not args.no_store))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
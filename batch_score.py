@@ -0,0 +1,240 @@
+"""
+Skill Gap AI - batch scoring from the command line.
+
+Scores every PDF / DOCX / TXT resume under a directory against one or more
+job descriptions, without Streamlit:
+
+    python batch_score.py resumes/ --jd backend.pdf --jd data.docx \\
+        --out scores.jsonl --jobs 8
+
+- Each JD is compiled once into a JDProfile (saved next to the document
+  store and reused by later runs) and handed to every worker when the pool
+  starts; workers only parse resumes.
+- Resumes go through the same pipeline as the dashboard (extract_text,
+  clean_text, extract_skills, normalize_and_merge_skills) and are scored
+  against each profile, with the same results as compute_skill_gap.
+- One JSON line per resume is appended to --out as soon as it is scored.
+  Re-running with the same --out skips resumes already scored against the
+  same JDs (failed ones and files changed since are scored again), so an
+  interrupted run can resume.
+- A throughput summary is printed on stderr at the end.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import skill_analysis
+import text_extraction
+from jd_profile import PROFILE_DIR, cached_profile
+from skill_analysis import content_hash, parse_document
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# Futures in flight per worker: keeps the pool busy without queueing the
+# whole directory up front
+QUEUE_DEPTH = 4
+
+# ================= JOB DESCRIPTIONS =================
+
+def load_jd_profiles(paths, profile_dir=PROFILE_DIR):
+    """Compile each JD once: [(name, JDProfile)], plus a key for the set"""
+    profiles = []
+    hashes = []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        try:
+            profile = cached_profile(data, directory=profile_dir)
+        except ValueError as e:
+            raise SystemExit(f"{path}: {e}")
+        if not len(profile):
+            print(f"warning: no skills found in job description {path}", file=sys.stderr)
+        profiles.append((os.path.basename(path), profile))
+        hashes.append(profile.jd_hash)
+
+    # Results are only reused for exactly the same JDs (and skill extraction)
+    jd_key = hashlib.sha256(
+        "\n".join(sorted(hashes) + [skill_analysis.SKILLS_VERSION]).encode("utf-8")
+    ).hexdigest()[:16]
+    return profiles, jd_key
+
+# ================= WORKERS =================
+
+_jd_profiles = []
+_jd_key = ""
+
+def _init_worker(jd_profiles, jd_key, use_store):
+    global _jd_profiles, _jd_key
+    _jd_profiles = jd_profiles
+    _jd_key = jd_key
+    # Loading the JD profiles opened the store in the parent before the fork
+    skill_analysis.reset_document_store()
+    if not use_store:
+        skill_analysis.STORE_PATH = ""
+    text_extraction.use_single_page_worker()
+
+def score_file(path, root):
+    """Parse one resume and score it against every JD; never raises"""
+    start = time.perf_counter()
+    record = {"file": os.path.relpath(path, root), "jd_key": _jd_key}
+    try:
+        record["mtime_ns"] = os.stat(path).st_mtime_ns
+        with open(path, "rb") as f:
+            data = f.read()
+        record["bytes"] = len(data)
+        record["sha256"] = content_hash(data)
+
+        doc = parse_document(data)
+        if doc.error:
+            record["error"] = doc.error
+        else:
+            names = frozenset(s["name"].lower() for s in doc.skills)
+            record["candidate"] = doc.name
+            record["linkedin"] = doc.linkedin
+            record["email"] = doc.email
+            record["phone"] = doc.phone
+            record["github"] = doc.github
+            record["resume_skills"] = sorted(names)
+            if doc.truncated:
+                record["truncated"] = True  # rescored on the next run
+            record["results"] = [{"jd": jd, **profile.gap(names)} for jd, profile in _jd_profiles]
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+# ================= DRIVER =================
+
+def find_resumes(root):
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(RESUME_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return sorted(found)
+
+def load_done(out_path, jd_key):
+    """
+    Files already scored successfully (and read in full) against this JD
+    set: relative path -> the record, whose size, mtime and sha256 say
+    which version of the file was scored.
+    """
+    done = {}
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # line cut short by an interrupted run
+            if record.get("jd_key") == jd_key and "error" not in record and not record.get("truncated"):
+                done[record["file"]] = record  # the latest version scored wins
+    return done
+
+def is_done(path, record):
+    """
+    Whether the file at `path` is the one `record` scored. Cheap when the
+    file is untouched (same size and mtime); otherwise its hash decides, so
+    a file that was only touched is not scored again.
+    """
+    if record is None:
+        return False
+    try:
+        stat = os.stat(path)
+        if stat.st_size != record.get("bytes"):
+            return False
+        if stat.st_mtime_ns == record.get("mtime_ns"):
+            return True
+        with open(path, "rb") as f:
+            return content_hash(f.read()) == record.get("sha256")
+    except OSError:
+        return False  # scoring it records the error
+
+def _iter_scored(paths, root, jobs, initargs):
+    if jobs <= 1:
+        _init_worker(*initargs)
+        for path in paths:
+            yield score_file(path, root)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+        pending = set()
+        paths = iter(paths)
+        for path in paths:
+            pending.add(pool.submit(score_file, path, root))
+            if len(pending) >= jobs * QUEUE_DEPTH:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+def run(resume_dir, jd_paths, out_path, jobs, use_store, progress_every):
+    start = time.perf_counter()
+    if not use_store:
+        skill_analysis.STORE_PATH = ""
+    jd_profiles, jd_key = load_jd_profiles(jd_paths, PROFILE_DIR if use_store else None)
+    jd_ms = (time.perf_counter() - start) * 1000
+
+    paths = find_resumes(resume_dir)
+    done = load_done(out_path, jd_key)
+    todo = [p for p in paths if not is_done(p, done.get(os.path.relpath(p, resume_dir)))]
+    print(f"{len(paths)} resumes found, {len(paths) - len(todo)} already scored, "
+          f"{len(todo)} to score with {jobs} job(s)", file=sys.stderr)
+
+    scored = errors = total_bytes = 0
+    latencies = []
+    start = time.perf_counter()
+    with open(out_path, "a", encoding="utf-8") as out:
+        initargs = (jd_profiles, jd_key, use_store)
+        for record in _iter_scored(todo, resume_dir, jobs, initargs):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            scored += 1
+            errors += "error" in record
+            total_bytes += record.get("bytes", 0)
+            latencies.append(record["elapsed_ms"])
+            if progress_every and scored % progress_every == 0:
+                print(f"  {scored}/{len(todo)} scored", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    rate = scored / elapsed if elapsed > 0 else 0.0
+    print(
+        f"scored {scored} resumes ({errors} failed) against {len(jd_profiles)} JD(s) "
+        f"in {elapsed:.1f}s: {rate:.1f} resumes/s, {total_bytes / 1e6 / max(elapsed, 1e-9):.2f} MB/s\n"
+        f"per-resume latency p50 {_percentile(latencies, 0.5):.0f} ms, "
+        f"p95 {_percentile(latencies, 0.95):.0f} ms, max {latencies[-1] if latencies else 0:.0f} ms; "
+        f"JD parsing {jd_ms:.0f} ms",
+        file=sys.stderr,
+    )
+    return 1 if errors else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of resumes against job descriptions")
+    parser.add_argument("resume_dir", help="directory searched recursively for .pdf/.docx/.txt resumes")
+    parser.add_argument("--jd", action="append", required=True, help="job description file (repeatable)")
+    parser.add_argument("--out", default="batch_scores.jsonl", help="JSONL output, appended to and resumed from")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes (1 = in-process)")
+    parser.add_argument("--no-store", action="store_true", help="don't read or write the parsed-document store or JD profiles")
+    parser.add_argument("--progress", type=int, default=100, help="report progress every N resumes (0 = off)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.resume_dir):
+        parser.error(f"not a directory: {args.resume_dir}")
+    return run(args.resume_dir, args.jd, args.out, max(1, args.jobs), not args.no_store, args.progress)
+
+if __name__ == "__main__":
+    sys.exit(main())
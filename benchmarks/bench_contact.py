@@ -0,0 +1,95 @@
+"""
+Contact extraction cost per resume as documents get longer: the previous
+extract_name_and_linkedin (uncompiled regexes over the whole text, a
+"Name:" search on every line) against extract_contact, which reads the
+header region and only jumps to anchored lines elsewhere.
+
+    python benchmarks/bench_contact.py [--pages 1 10 100]
+
+Two layouts per size: contact block at the top, and no contact details at
+all (the worst case for both: every fallback runs).
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skill_analysis import extract_contact, segment
+
+HEADER = "Jane Doe\njane.doe@gmail.com | +91 98765 43210 | linkedin.com/in/janedoe | github.com/janedoe\n"
+PAGE = (
+    "EXPERIENCE\nData Engineer, Acme Corp (2019 - 2023)\n"
+    "Built batch and streaming pipelines in Python and SQL for the analytics team.\n"
+    "Owned the reporting warehouse and mentored two junior engineers.\n"
+    "TECHNICAL SKILLS\nPython, SQL, Pandas, Power BI, Git\n"
+) * 12
+
+def previous(text):
+    """The previous extract_name_and_linkedin, condensed"""
+    name, linkedin_url = "Candidate", ""
+    for link_text, url in re.findall(r'\[([^\]]+)\]\(([^)]+)\)', text):
+        if 'linkedin.com' in url.lower():
+            linkedin_url = url
+            break
+        elif 'linkedin.com' in link_text.lower():
+            linkedin_url = link_text
+            break
+    if not linkedin_url:
+        match = re.search(r'LinkedIn[:]?\s*([^\s]+)', text, re.IGNORECASE)
+        if match and 'linkedin.com' in match.group(1).lower():
+            linkedin_url = match.group(1)
+    if not linkedin_url:
+        for pattern in [r'(https?://(?:www\.)?linkedin\.com/[^\s]+)', r'(www\.linkedin\.com/[^\s]+)',
+                        r'(linkedin\.com/[^\s]+)']:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                linkedin_url = match.group(1)
+                break
+    lines = text.split('\n')
+    for line in lines[:10]:
+        line = line.strip()
+        if line:
+            clean_line = re.sub(r'^[#\*\s]+|[#\*\s]+$', '', line)
+            words = clean_line.split()
+            if 2 <= len(words) <= 4 and sum(1 for w in words if w[0].isupper()) >= len(words) - 1:
+                if not any(x in line.lower() for x in ['@', 'http', '://', 'www.', 'linkedin', 'phone', 'mobile']):
+                    name = clean_line
+                    break
+    if name == "Candidate":
+        for line in lines:
+            match = re.search(r'Name[:]?\s*([A-Z][a-zA-Z]*(?:\s+[A-Z][a-zA-Z]*)+)', line, re.IGNORECASE)
+            if match:
+                name = match.group(1).strip()
+                break
+    if name == "Candidate":
+        re.search(r'([a-zA-Z0-9._%+-]+)@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+    return name, linkedin_url
+
+def per_doc_us(func, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(20):
+            func(text)
+        best = min(best, (time.perf_counter() - start) / 20)
+    return best * 1e6
+
+def run(pages, repeat):
+    print(f"{'chars':>8} {'layout':>11} {'previous us':>12} {'extract_contact us':>19}")
+    for n in pages:
+        for layout, text in (("header", HEADER + PAGE * n), ("no contact", PAGE * n)):
+            segment(text)  # shared with skill extraction in parse_text, not timed here
+            old = per_doc_us(previous, text, repeat)
+            new = per_doc_us(extract_contact, text, repeat)
+            print(f"{len(text):>8} {layout:>11} {old:>12.0f} {new:>19.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
@@ -0,0 +1,73 @@
+"""
+Compare text-extraction backends on a sample corpus.
+
+For every PDF/DOCX file in the corpus directory, each backend is timed and
+the skills it yields are compared with the high-fidelity backend of the same
+format (pdfplumber-layout / python-docx), which is used as the reference.
+
+    python benchmarks/bench_extraction_backends.py [corpus_dir] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skill_analysis import clean_text, extract_skills, normalize_and_merge_skills
+from text_extraction import BACKENDS, EXTRACTION_POLICIES, looks_degenerate
+
+REFERENCE = {"pdf": "pdfplumber-layout", "docx": "python-docx"}
+
+def skill_set(text):
+    return {s["name"].lower() for s in normalize_and_merge_skills(extract_skills(clean_text(text)))}
+
+def load_corpus(corpus_dir):
+    corpus = {"pdf": [], "docx": []}
+    for name in sorted(os.listdir(corpus_dir)):
+        kind = name.rsplit(".", 1)[-1].lower()
+        if kind in corpus:
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                corpus[kind].append((name, f.read()))
+    return corpus
+
+def run(corpus_dir, repeat):
+    corpus = load_corpus(corpus_dir)
+
+    for kind, files in corpus.items():
+        if not files:
+            continue
+        print(f"\n{kind.upper()}: {len(files)} files, reference = {REFERENCE[kind]}")
+        print(f"{'backend':<20}{'docs/s':>10}{'MB/s':>10}{'recall':>10}{'degenerate':>12}")
+
+        reference = {name: skill_set(BACKENDS[kind][REFERENCE[kind]](data)) for name, data in files}
+        total_bytes = sum(len(data) for _, data in files) * repeat
+
+        for backend, extract in BACKENDS[kind].items():
+            found = expected = degenerate = 0
+            elapsed = 0.0
+            for name, data in files:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    text = extract(data)
+                elapsed += time.perf_counter() - start
+
+                skills = skill_set(text)
+                found += len(skills & reference[name])
+                expected += len(reference[name])
+                degenerate += looks_degenerate(text)
+
+            recall = found / expected if expected else 1.0
+            docs_per_s = len(files) * repeat / elapsed if elapsed else float("inf")
+            mb_per_s = total_bytes / elapsed / 1e6 if elapsed else float("inf")
+            print(f"{backend:<20}{docs_per_s:>10.1f}{mb_per_s:>10.2f}{recall:>10.1%}{degenerate:>12}")
+
+    print("\nPolicies:", ", ".join(f"{k} = {v}" for k, v in EXTRACTION_POLICIES.items()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus_dir", nargs="?", default=os.path.join(os.path.dirname(__file__), ".."))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.corpus_dir, args.repeat)
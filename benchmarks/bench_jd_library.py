@@ -0,0 +1,97 @@
+"""
+Rank a library of synthetic JDs for one resume: JDLibrary.rank (resume
+parsed once, one vectorized pass) against a full analyze_texts run per JD,
+the way the dashboard would have to do it. Also checks that both give the
+same top-N overall match and partial counts.
+
+    python benchmarks/bench_jd_library.py [--jds 2000] [--top 10] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from jd_library import JDLibrary
+from skill_analysis import PARTIAL_MATCHES, SOFT_SKILLS, TECHNICAL_SKILLS, analyze_texts, parse_text
+
+def synthetic_jds(n, rng):
+    # Synonym variants in the mix so partial matches show up
+    technical = TECHNICAL_SKILLS + sorted(PARTIAL_MATCHES)
+    return [
+        f"Role {i}\nRequirements: {', '.join(rng.sample(technical, rng.randint(8, 30)))}.\n"
+        f"Soft skills: {', '.join(rng.sample(SOFT_SKILLS, 3))}.\n"
+        for i in range(n)
+    ]
+
+def synthetic_resume(rng):
+    return (
+        "Candidate\nTECHNICAL SKILLS\n"
+        f"{', '.join(rng.sample(TECHNICAL_SKILLS + sorted(PARTIAL_MATCHES), 25))}\n"
+        f"Soft Skills\n{', '.join(rng.sample(SOFT_SKILLS, 4))}\n"
+    )
+
+def naive_rank(resume_text, jd_texts, top):
+    ranked = []
+    for i, jd in enumerate(jd_texts):
+        result = analyze_texts(resume_text, jd)
+        ranked.append((-result.overall_match, -len(result.partial), i))
+    ranked.sort()
+    return [(-overall, -partial, i) for overall, partial, i in ranked[:top]]
+
+def run(n_jds, top, queries, seed):
+    rng = random.Random(seed)
+    jd_texts = synthetic_jds(n_jds, rng)
+
+    start = time.perf_counter()
+    jd_docs = [parse_text(text) for text in jd_texts]
+    parse_s = time.perf_counter() - start
+    start = time.perf_counter()
+    library = JDLibrary()
+    library.add_many((i, doc.skills, doc.name) for i, doc in enumerate(jd_docs))
+    library.rank([], 1)  # build the matrix and adjacency
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"library: {len(library)} JDs over {len(library.vocab)} skills; "
+          f"JD parsing {parse_s:.1f}s (once), encoding {build_ms:.0f} ms")
+
+    resumes = [synthetic_resume(rng) for _ in range(queries)]
+    parse_ms, rank_ms = [], []
+    for text in resumes:
+        start = time.perf_counter()
+        skills = parse_text(text).skills
+        parse_ms.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        library.rank(skills, top)
+        rank_ms.append((time.perf_counter() - start) * 1000)
+
+    # The per-JD loop is slow: time and check it on a few resumes only
+    mismatches = 0
+    naive_times = []
+    for text in resumes[:3]:
+        start = time.perf_counter()
+        expected = naive_rank(text, jd_texts, top)
+        naive_times.append((time.perf_counter() - start) * 1000)
+        hits = library.rank(parse_text(text).skills, top)
+        mismatches += [(h["overall_match"], h["partial"], h["jd_id"]) for h in hits] != expected
+    naive_ms = min(naive_times)
+
+    total = sorted(p + r for p, r in zip(parse_ms, rank_ms))
+    rank_ms.sort()
+    print(f"{queries} resumes, top-{top}:")
+    print(f"  rank only:          p50 {rank_ms[len(rank_ms) // 2]:.2f} ms, max {rank_ms[-1]:.2f} ms")
+    print(f"  parse + rank:       p50 {total[len(total) // 2]:.2f} ms")
+    print(f"  analyze_texts x {n_jds}: {naive_ms:.0f} ms ({naive_ms / total[len(total) // 2]:.0f}x slower)")
+    print(f"resumes whose top-{top} differs from the per-JD loop: {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jds", type=int, default=2000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(run(args.jds, args.top, args.queries, args.seed))
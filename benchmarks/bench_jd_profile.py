@@ -0,0 +1,94 @@
+"""
+Per-resume cost of scoring against one JD, with and without a precompiled
+JDProfile:
+
+- without: analyze_texts(resume, jd), i.e. the JD is extracted, merged and
+  matched again for every resume, as the dashboard pipeline does;
+- with:    parse_text(resume) + profile.gap(resume skills), the profile
+  loaded once from disk.
+
+Also times the comparison step alone (compute_skill_gap vs profile.score)
+and checks that both paths give the same matched/partial/missing sets.
+
+    python benchmarks/bench_jd_profile.py [--resumes 300] [--jd-skills 40]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from jd_profile import JDProfile
+from skill_analysis import SOFT_SKILLS, TECHNICAL_SKILLS, analyze_texts, compute_skill_gap, parse_text
+
+def synthetic_texts(n_resumes, jd_skills, rng):
+    jd = (
+        "Senior Engineer\nResponsibilities: build and run data services.\nRequirements: "
+        + ", ".join(rng.sample(TECHNICAL_SKILLS, jd_skills)) + ".\n"
+        + "Soft skills: " + ", ".join(rng.sample(SOFT_SKILLS, 4)) + ".\n"
+    )
+    resumes = [
+        f"Candidate {i}\nlinkedin.com/in/candidate{i}\nTECHNICAL SKILLS\n"
+        f"{', '.join(rng.sample(TECHNICAL_SKILLS, 20))}\nSoft Skills\n{', '.join(rng.sample(SOFT_SKILLS, 3))}\n"
+        "EXPERIENCE\nBuilt pipelines and dashboards for the analytics team.\n"
+        for i in range(n_resumes)
+    ]
+    return resumes, jd
+
+def per_call_ms(func, items):
+    times = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), statistics.fmean(times)
+
+def run(n_resumes, jd_skills, seed):
+    rng = random.Random(seed)
+    resumes, jd = synthetic_texts(n_resumes, jd_skills, rng)
+
+    start = time.perf_counter()
+    profile = JDProfile.from_text(jd)
+    build_ms = (time.perf_counter() - start) * 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jd.json")
+        profile.save(path)
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        profile = JDProfile.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+    print(f"JD profile: {len(profile)} skills ({len(profile.soft)} soft), vocabulary {len(profile.vocab)}; "
+          f"build {build_ms:.1f} ms, load {load_ms:.2f} ms, {size / 1024:.1f} KB on disk")
+
+    jd_names = frozenset(s["name"].lower() for s in parse_text(jd).skills)
+    resume_names = [frozenset(s["name"].lower() for s in parse_text(r).skills) for r in resumes]
+    mismatches = sum(compute_skill_gap(names, jd_names) != profile.score(names) for names in resume_names)
+
+    without = per_call_ms(lambda text: analyze_texts(text, jd), resumes)
+    with_profile = per_call_ms(
+        lambda text: profile.gap(frozenset(s["name"].lower() for s in parse_text(text).skills)), resumes
+    )
+    compare_old = per_call_ms(lambda names: compute_skill_gap(names, jd_names), resume_names)
+    compare_new = per_call_ms(profile.score, resume_names)
+
+    print(f"{n_resumes} resumes, per resume (median / mean ms):")
+    print(f"  {'without profile (analyze_texts)':<36} {without[0]:>8.3f} / {without[1]:.3f}")
+    print(f"  {'with profile (parse resume + gap)':<36} {with_profile[0]:>8.3f} / {with_profile[1]:.3f}"
+          f"   {without[0] / with_profile[0]:.1f}x")
+    print(f"  {'comparison only: compute_skill_gap':<36} {compare_old[0]:>8.3f} / {compare_old[1]:.3f}")
+    print(f"  {'comparison only: profile.score':<36} {compare_new[0]:>8.3f} / {compare_new[1]:.3f}")
+    print(f"results differing from compute_skill_gap: {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--jd-skills", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(run(args.resumes, args.jd_skills, args.seed))
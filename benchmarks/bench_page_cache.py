@@ -0,0 +1,95 @@
+"""
+Cost of re-uploading a lightly edited resume: parse_document on a revision
+with one changed page (the other pages come from the page cache) against a
+full parse of the same file, and against parsing a one-page document.
+Also checks the page-level result is identical to the whole-document one.
+
+    python benchmarks/bench_page_cache.py [--pages 5] [--revisions 10]
+
+Every revision edits a different page with fresh text, so nothing but the
+unchanged pages can come from a cache. The on-disk store is disabled.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ["SKILL_GAP_STORE"] = ""
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import skill_analysis
+from skill_analysis import PDF_TYPE, SOFT_SKILLS, TECHNICAL_SKILLS, clean_text, parse_document, parse_text
+from text_extraction import extract_with_policy
+
+def page_lines(rng):
+    lines = []
+    for head in rng.sample(["TECHNICAL SKILLS", "Soft Skills:", "PROJECTS", "EXPERIENCE", "EDUCATION"], 3):
+        pool = SOFT_SKILLS if head.startswith("Soft") else TECHNICAL_SKILLS
+        lines.append(head)
+        for _ in range(12):
+            lines.append(f"Delivered {', '.join(rng.sample(pool, 3))} work for the analytics team in {rng.randint(2015, 2024)}.")
+    return lines
+
+def make_pdf(pages):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=9)
+    for lines in pages:
+        pdf.add_page()
+        for line in lines:
+            pdf.cell(0, 5, line.encode("latin-1", "replace").decode("latin-1"), ln=1)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+def whole_document(data):
+    """The pipeline without page caching: extract everything, then parse"""
+    raw, _ = extract_with_policy(data, "pdf")
+    return parse_text(clean_text(raw))
+
+def timed_ms(func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    return (time.perf_counter() - start) * 1000, value
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+def run(n_pages, revisions, seed):
+    rng = random.Random(seed)
+    pages = [["Jane Doe", "jane.doe@gmail.com | linkedin.com/in/janedoe"] + page_lines(rng)]
+    pages += [page_lines(rng) for _ in range(n_pages - 1)]
+    parse_document(make_pdf(pages), PDF_TYPE)  # first upload fills the page cache
+
+    full_ms, revision_ms, one_page_ms = [], [], []
+    mismatches = 0
+    for _ in range(revisions):
+        edited = rng.randrange(n_pages)
+        pages[edited] = page_lines(rng)
+        data = make_pdf(pages)
+
+        elapsed, doc = timed_ms(parse_document, data, PDF_TYPE)
+        revision_ms.append(elapsed)
+        elapsed, expected = timed_ms(whole_document, data)
+        full_ms.append(elapsed)
+        mismatches += (doc.text, doc.skills, doc.contact()) != (expected.text, expected.skills, expected.contact())
+
+        one_page_ms.append(timed_ms(whole_document, make_pdf([page_lines(rng)]))[0])
+        skill_analysis.DOCUMENT_CACHE.clear()
+
+    print(f"{n_pages}-page resume, {revisions} revisions with one edited page each (median ms):")
+    print(f"  full parse of the revision:   {median(full_ms):8.1f}")
+    print(f"  page-cached parse_document:   {median(revision_ms):8.1f}  ({median(full_ms) / median(revision_ms):.1f}x faster)")
+    print(f"  full parse of a 1-page PDF:   {median(one_page_ms):8.1f}")
+    print(f"revisions whose result differs from a full parse: {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--revisions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(run(args.pages, args.revisions, args.seed))
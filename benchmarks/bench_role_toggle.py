@@ -0,0 +1,146 @@
+"""
+End-to-end latency of toggling the Milestone 4 "Role View" radio.
+
+Runs app_final.py headlessly (Streamlit AppTest) with a synthetic resume and
+JD fed to the file uploaders, then flips the radio back and forth and times
+each rerun. Also counts how often the analysis pipeline ran during the
+toggles (it should be zero once the snapshot is in session state).
+
+AppTest always reruns the whole script, while a browser only reruns the
+fragment that owns the widget, so the time spent inside st.fragment
+functions is reported separately: that is what a toggle costs in the app.
+
+    python benchmarks/bench_role_toggle.py [--skills 40] [--toggles 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def app_script(root, resume_text, jd_text):
+    import io
+    import os
+    import runpy
+    import sys
+
+    import streamlit as st
+
+    sys.path.insert(0, root)
+    import skill_analysis
+
+    class Upload(io.BytesIO):
+        type = "text/plain"
+
+    docs = {"resume": resume_text.encode("utf-8"), "jd": jd_text.encode("utf-8")}
+    st.file_uploader = lambda label, type=None, key=None, **kwargs: Upload(docs[key])
+
+    # Count pipeline runs across reruns of this interpreter
+    if not hasattr(skill_analysis, "_bench_calls"):
+        skill_analysis._bench_calls = 0
+        analyze = skill_analysis.analyze
+
+        def counted(*args, **kwargs):
+            skill_analysis._bench_calls += 1
+            return analyze(*args, **kwargs)
+
+        skill_analysis.analyze = counted
+
+    # Time fragment bodies: in a browser, a toggle reruns only these
+    if not hasattr(st, "_bench_fragment_ms"):
+        import time
+
+        st._bench_fragment_ms = []
+        fragment = st.fragment
+
+        def timed_fragment(func=None, **kwargs):
+            if func is None:
+                return lambda f: timed_fragment(f, **kwargs)
+
+            def body(*args, **kw):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kw)
+                finally:
+                    st._bench_fragment_ms.append((time.perf_counter() - start) * 1000)
+
+            body.__name__ = func.__name__
+            body.__qualname__ = func.__qualname__
+            body.__module__ = func.__module__
+            return fragment(body, **kwargs)
+
+        st.fragment = timed_fragment
+
+    runpy.run_path(os.path.join(root, "app_final.py"), run_name="__main__")
+
+def synthetic_documents(n_skills, seed):
+    sys.path.insert(0, ROOT)
+    from skill_analysis import SOFT_SKILLS, TECHNICAL_SKILLS
+
+    rng = random.Random(seed)
+    resume = rng.sample(TECHNICAL_SKILLS, min(n_skills, len(TECHNICAL_SKILLS)))
+    jd = rng.sample(TECHNICAL_SKILLS, min(n_skills, len(TECHNICAL_SKILLS)))
+    soft = rng.sample(SOFT_SKILLS, min(5, len(SOFT_SKILLS)))
+
+    resume_text = (
+        "Jane Doe\nlinkedin.com/in/janedoe\nPROFESSIONAL SUMMARY\nEngineer.\n"
+        f"TECHNICAL SKILLS\n{', '.join(resume)}\nSoft Skills\n{', '.join(soft)}\nEducation\nB.Tech\n"
+    )
+    jd_text = f"Requirements\n{', '.join(jd)}\n{', '.join(soft[:3])}\n"
+    return resume_text, jd_text
+
+def run(n_skills, toggles, seed):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    import skill_analysis
+
+    resume_text, jd_text = synthetic_documents(n_skills, seed)
+    app = AppTest.from_function(
+        app_script, args=(os.path.abspath(ROOT), resume_text, jd_text), default_timeout=120
+    )
+
+    start = time.perf_counter()
+    app.run()
+    print(f"first run (analysis + render): {(time.perf_counter() - start) * 1000:.0f} ms")
+    if app.exception:
+        print(f"FAIL: app raised {app.exception[0].message}")
+        return 1
+
+    calls_before = skill_analysis._bench_calls
+    fragment_ms = getattr(st, "_bench_fragment_ms", [])
+    fragments_before = len(fragment_ms)
+    timings = []
+    for i in range(toggles):
+        role = "Recruiter" if i % 2 == 0 else "Job Seeker"
+        start = time.perf_counter()
+        app.radio(key="role").set_value(role).run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if app.exception:
+            print(f"FAIL: toggle raised {app.exception[0].message}")
+            return 1
+
+    timings.sort()
+    print(f"radio toggle x{toggles}: p50 {timings[len(timings) // 2]:.0f} ms, "
+          f"max {timings[-1]:.0f} ms")
+    print(f"pipeline runs during toggles: {skill_analysis._bench_calls - calls_before}")
+
+    fragment_ms = sorted(fragment_ms[fragments_before:])
+    if fragment_ms:
+        print(f"fragment rerun (browser toggle): p50 {fragment_ms[len(fragment_ms) // 2]:.0f} ms, "
+              f"max {fragment_ms[-1]:.0f} ms")
+    else:
+        print("no st.fragment in the app: a browser toggle reruns the whole script")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=40)
+    parser.add_argument("--toggles", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    sys.exit(run(args.skills, args.toggles, args.seed))
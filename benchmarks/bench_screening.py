@@ -0,0 +1,99 @@
+"""
+Multi-resume screening throughput: scoring a batch of PDF resumes against
+one JD one after another in the calling process (what a loop over the
+single-resume view would do) against screening.Screening on the shared
+process pool. Also reports when the first leaderboard row was available,
+and checks both paths give every candidate the same score.
+
+    python benchmarks/bench_screening.py [--resumes 24] [--pages 2] [--workers 4]
+
+The on-disk store is disabled and the in-memory caches are cleared between
+runs, so every resume is really parsed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ["SKILL_GAP_STORE"] = ""
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import skill_analysis
+import screening
+from skill_analysis import PDF_TYPE, SOFT_SKILLS, TECHNICAL_SKILLS, parse_document
+
+def make_pdf(rng, pages):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_font("Helvetica", size=9)
+    for page in range(pages):
+        pdf.add_page()
+        if page == 0:
+            pdf.cell(0, 5, f"Candidate {rng.randint(1000, 9999)} Doe", ln=1)
+        for head in rng.sample(["TECHNICAL SKILLS", "Soft Skills:", "PROJECTS", "EXPERIENCE"], 3):
+            pool = SOFT_SKILLS if head.startswith("Soft") else TECHNICAL_SKILLS
+            pdf.cell(0, 5, head, ln=1)
+            for _ in range(12):
+                line = f"Delivered {', '.join(rng.sample(pool, 3))} work for the analytics team."
+                pdf.cell(0, 5, line.encode("latin-1", "replace").decode("latin-1"), ln=1)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+def clear_caches():
+    skill_analysis.DOCUMENT_CACHE.clear()
+    skill_analysis.PAGE_CACHE.clear()
+
+def serial(files, jd_doc):
+    start = time.perf_counter()
+    results, first = {}, None
+    for name, data, file_type in files:
+        results[skill_analysis.content_hash(data)] = screening.score_resume(data, file_type, jd_doc)
+        first = first or time.perf_counter() - start
+    return time.perf_counter() - start, first, results
+
+def pooled(files, jd_doc, pool):
+    start = time.perf_counter()
+    run = screening.Screening(jd_doc, "jd", files)
+    run.start(pool)
+    first = None
+    while not run.done:
+        time.sleep(0.01)
+        run.poll()
+        if first is None and run.results:
+            first = time.perf_counter() - start
+    return time.perf_counter() - start, first, run
+
+def run(n_resumes, pages, workers, seed):
+    rng = random.Random(seed)
+    jd_text = "Required skills: " + ", ".join(rng.sample(TECHNICAL_SKILLS, 12) + rng.sample(SOFT_SKILLS, 3))
+    jd_doc = parse_document(jd_text.encode(), "text/plain")
+    files = [(f"resume_{i}.pdf", make_pdf(rng, pages), PDF_TYPE) for i in range(n_resumes)]
+
+    clear_caches()
+    serial_s, serial_first, expected = serial(files, jd_doc)
+
+    clear_caches()  # before the pool starts, so workers do not inherit warm caches
+    pool = screening.get_pool(workers)
+    pool.submit(int).result()  # start the workers before timing
+    pooled_s, pooled_first, result = pooled(files, jd_doc, pool)
+    screening.shutdown_pool()
+
+    same = {h: r.overall_match for h, r in expected.items()} == {h: r.overall_match for h, r in result.results.items()}
+    print(f"{n_resumes} resumes x {pages} pages, {workers} workers:")
+    print(f"  serial:        {serial_s:6.2f} s total, first row after {serial_first:5.2f} s")
+    print(f"  process pool:  {pooled_s:6.2f} s total, first row after {pooled_first:5.2f} s"
+          f"  ({serial_s / pooled_s:.1f}x throughput)")
+    print(f"scores match the serial ones: {same}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=24)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.exit(run(args.resumes, args.pages, args.workers, args.seed))
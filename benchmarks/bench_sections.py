@@ -0,0 +1,123 @@
+"""
+Section handling per document: the single-pass segmenter (skill_analysis.
+segment, shared by the soft-skills window, the professional summary and the
+technical-terms scan) against the previous per-extractor splitting, which
+lowercased and re-split the full text in each extractor.
+
+    python benchmarks/bench_sections.py [--docs 300] [--scale 1 8]
+
+Only the section work is timed; the skill scan itself is the same for both.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import skill_analysis
+from skill_analysis import SOFT_SKILLS, TECHNICAL_SKILLS, segment
+
+def previous_soft_window(text):
+    full_text_lower = text.lower()
+    soft_window = (0, len(full_text_lower))
+    if "soft skills" in full_text_lower:
+        parts = full_text_lower.split("soft skills", 1)
+        if len(parts) > 1:
+            remaining = parts[1]
+            for phrase in ["education", "projects", "experience", "certification", "hobbies", "declaration"]:
+                if phrase in remaining:
+                    remaining = remaining.split(phrase, 1)[0]
+            soft_start = len(parts[0]) + len("soft skills")
+            soft_window = (soft_start, soft_start + len(remaining[:2000]))
+    return soft_window
+
+def previous_summary(text):
+    text = re.sub(r"\n{2,}", "\n", text)
+    start_headers = ["PROFESSIONAL SUMMARY", "SUMMARY", "CAREER OBJECTIVE", "OBJECTIVE", "PROFILE", "ABOUT ME"]
+    top_headers = ["TECHNICAL SKILLS", "SOFT SKILLS", "SKILLS", "PROJECTS", "EDUCATION", "EXPERIENCE",
+                   "CERTIFICATIONS", "ACHIEVEMENTS"]
+    collected = []
+    capturing = False
+    for line in text.split("\n"):
+        clean = line.strip()
+        upper = clean.upper()
+        for header in start_headers:
+            if upper.startswith(header):
+                capturing = True
+                inline = clean[len(header):].strip(" :-")
+                if inline:
+                    collected.append(inline)
+                break
+        else:
+            if capturing:
+                if any(upper.startswith(h) for h in top_headers):
+                    break
+                if clean:
+                    collected.append(clean)
+    return " ".join(collected).strip()
+
+def previous_terms(text):
+    results, seen = [], set()
+    for line in text.split("\n"):
+        if any(k in line.lower() for k in ["technical", "skills", "tools", "technologies", "hardware"]):
+            for t in re.findall(r'\b[A-Z][A-Za-z0-9\-]{2,}\b', line):
+                if t.lower() not in seen:
+                    seen.add(t.lower())
+                    results.append(t)
+    return results
+
+def previous(text):
+    previous_soft_window(text)
+    previous_summary(text)
+    previous_terms(text)
+
+def current(text):
+    segment.cache_clear()
+    sections = segment(text)
+    sections.first("SOFT SKILLS")
+    skill_analysis.extract_professional_summary(text)
+    skill_analysis.extract_additional_technical_terms(text)
+
+def synthetic_resume(rng):
+    heads = ["TECHNICAL SKILLS", "Soft Skills:", "PROJECTS", "EDUCATION", "EXPERIENCE", "CERTIFICATIONS"]
+    parts = ["Jane Doe", "jane.doe@mail.com | linkedin.com/in/janedoe", "PROFESSIONAL SUMMARY",
+             "Engineer with experience building data systems and mentoring teams."]
+    for head in heads:
+        pool = SOFT_SKILLS if head.startswith("Soft") else TECHNICAL_SKILLS
+        parts += [head] + [", ".join(rng.sample(pool, 4)) for _ in range(3)]
+        parts += ["Delivered projects end to end, from requirements to deployment."] * 2
+    return "\n".join(parts)
+
+def per_doc_us(func, docs, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            func(doc)
+        best = min(best, (time.perf_counter() - start) / len(docs))
+    return best * 1e6
+
+def run(n_docs, scales, repeat, seed):
+    rng = random.Random(seed)
+    base = [synthetic_resume(rng) for _ in range(n_docs)]
+    print(f"{'chars':>7} {'spans':>6} {'previous us':>12} {'segmenter us':>13}")
+    for scale in scales:
+        docs = ["\n".join([doc] * scale) for doc in base]
+        chars = sum(map(len, docs)) / len(docs)
+        spans = sum(len(segment(doc).spans) for doc in docs) / len(docs)
+        old = per_doc_us(previous, docs, repeat)
+        new = per_doc_us(current, docs, repeat)
+        print(f"{chars:>7.0f} {spans:>6.0f} {old:>12.0f} {new:>13.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.docs, args.scale, args.repeat, args.seed)
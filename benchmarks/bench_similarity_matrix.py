@@ -0,0 +1,85 @@
+"""
+Build the Similarity Matrix for synthetic JDs of increasing size and compare
+the batched figure (charts.similarity_matrix_figure) with the previous
+one-trace-per-JD-skill figure: build time, trace count and JSON payload.
+
+    python benchmarks/bench_similarity_matrix.py [--sizes 15 150 1000]
+
+Browser render time isn't measured here; payload size and trace count are
+the headless proxies for it.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import plotly.graph_objects as go
+
+from charts import COLOR_MAP, SIZE_MAP, STATUS_ROW, similarity_matrix_figure, similarity_matrix_rows
+from skill_analysis import PARTIAL_MATCHES
+
+def per_skill_figure(rows):
+    """The previous layout: one go.Scatter trace per JD skill"""
+    fig = go.Figure()
+    for name, status, hit in rows:
+        fig.add_trace(go.Scatter(
+            x=[name],
+            y=[STATUS_ROW[status]],
+            mode="markers+text" if status == "partial" else "markers",
+            text=[hit] if status == "partial" else None,
+            textposition="top center",
+            marker=dict(size=SIZE_MAP[status], color=COLOR_MAP[status], line=dict(color="black", width=1)),
+            hovertemplate=(
+                "<b>JD Skill:</b> %{x}<br>"
+                "<b>Status:</b> " + STATUS_ROW[status] + "<br>" +
+                "<b>Matched Resume Skill:</b> " + (hit if hit else "—") + "<extra></extra>"
+            ),
+            showlegend=False
+        ))
+    fig.update_layout(height=380, plot_bgcolor="white", showlegend=False)
+    return fig
+
+def synthetic_skills(n, rng):
+    """
+    n JD skills (synonym-group variants first, so partial matches show up)
+    and a resume holding about half of them plus one partner per variant
+    """
+    variants = sorted(PARTIAL_MATCHES)[:n // 4]
+    jd = variants + [f"skill {i:04d}" for i in range(n - len(variants))]
+    resume = rng.sample(jd, n // 2)
+    for v in variants:
+        resume.append(rng.choice(sorted(PARTIAL_MATCHES[v])))
+    return jd, resume
+
+def measure(build, rows, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fig = build(rows)
+    build_ms = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    payload = fig.to_json()
+    json_ms = (time.perf_counter() - start) * 1000
+    return build_ms, json_ms, len(fig.data), len(payload)
+
+def run(sizes, repeat, seed):
+    rng = random.Random(seed)
+    print(f"{'skills':>7} {'layout':>10} {'traces':>7} {'build ms':>9} {'json ms':>8} {'payload KB':>11}")
+    for n in sizes:
+        jd, resume = synthetic_skills(n, rng)
+        rows = similarity_matrix_rows(jd, resume, {r: r for r in resume})
+        for label, build in (("per-skill", per_skill_figure), ("batched", similarity_matrix_figure)):
+            build_ms, json_ms, traces, size = measure(build, rows, repeat)
+            print(f"{n:>7} {label:>10} {traces:>7} {build_ms:>9.1f} {json_ms:>8.1f} {size / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[15, 150, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat, args.seed)
@@ -0,0 +1,92 @@
+"""
+Render the Skill Comparison and Key Skill Match Percentages sections for
+synthetic analyses of increasing size, headlessly (Streamlit AppTest), and
+compare the single-element version (charts.py) with the previous two
+st.markdown calls per skill: script run time and element count.
+
+    python benchmarks/bench_skill_comparison.py [--sizes 50 500 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def sections_script(root, all_skills, jd_skill_names, matched, partial, layout):
+    import sys
+
+    import streamlit as st
+
+    sys.path.insert(0, root)
+    from charts import COMPARISON_STYLE, comparison_statuses, match_badges_html, skill_comparison_frame
+
+    statuses = comparison_statuses(all_skills, jd_skill_names, set(matched), set(partial))
+
+    if layout == "single":
+        st.dataframe(
+            skill_comparison_frame(all_skills, statuses),
+            hide_index=True,
+            column_config={
+                "Match": st.column_config.ProgressColumn("Match", format="%d%%", min_value=0, max_value=100)
+            }
+        )
+        st.markdown(match_badges_html(all_skills, statuses), unsafe_allow_html=True)
+    else:
+        # The previous layout: two st.markdown calls per skill in each section
+        for skill, status in zip(all_skills, statuses):
+            label, percent, color, _ = COMPARISON_STYLE[status]
+            st.markdown(f"**{skill.title()}** – {label} ({percent}%)")
+            st.markdown(
+                f'<div style="background-color:{color};height:20px;border-radius:10px;width:{percent}%;margin:6px 0;"></div>',
+                unsafe_allow_html=True
+            )
+        cols = st.columns(min(len(all_skills), 6))
+        for i, (skill, status) in enumerate(zip(all_skills, statuses)):
+            _, percent, fg, bg = COMPARISON_STYLE[status]
+            cols[i % len(cols)].markdown(f"""
+            <div style="background:{bg};width:80px;height:80px;border-radius:50%;
+            display:flex;align-items:center;justify-content:center;margin:auto;border:3px solid {fg};">
+            <b style="color:{fg};font-size:18px;">{percent}%</b>
+            </div>
+            <p style="text-align:center;margin-top:6px;font-size:11px;"><b>{skill.title()}</b></p>
+            """, unsafe_allow_html=True)
+
+def synthetic_analysis(n, rng):
+    all_skills = [f"skill {i:05d}" for i in range(n)]
+    jd = rng.sample(all_skills, n * 2 // 3)
+    matched = jd[:len(jd) // 2]
+    partial = jd[len(jd) // 2:len(jd) * 2 // 3]
+    return all_skills, jd, matched, partial
+
+def run(sizes, seed):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    print(f"{'skills':>7} {'layout':>10} {'elements':>9} {'run ms':>9}")
+    for n in sizes:
+        args = synthetic_analysis(n, rng)
+        for layout in ("per-skill", "single"):
+            app = AppTest.from_function(
+                sections_script, args=(os.path.abspath(ROOT), *args, layout), default_timeout=600
+            )
+            start = time.perf_counter()
+            app.run()
+            elapsed = (time.perf_counter() - start) * 1000
+            if app.exception:
+                print(f"FAIL: {layout} raised {app.exception[0].message}")
+                return 1
+            elements = len(app.markdown) + len(app.dataframe)
+            print(f"{n:>7} {layout:>10} {elements:>9} {elapsed:>9.0f}")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    sys.exit(run(args.sizes, args.seed))
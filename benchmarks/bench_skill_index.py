@@ -0,0 +1,50 @@
+"""
+Build a SkillIndex over synthetic resumes and time top-k JD queries.
+
+    python benchmarks/bench_skill_index.py [--resumes 100000] [--k 10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skill_analysis import PARTIAL_MATCHES, SOFT_SKILLS, TECHNICAL_SKILLS
+from skill_index import SkillIndex
+
+def run(n_resumes, k, queries, seed):
+    rng = random.Random(seed)
+    vocab = sorted({s.lower() for s in TECHNICAL_SKILLS + SOFT_SKILLS} | set(PARTIAL_MATCHES))
+
+    start = time.perf_counter()
+    index = SkillIndex()
+    index.add_many((f"resume-{i}", rng.sample(vocab, rng.randint(5, 25))) for i in range(n_resumes))
+    print(f"built index over {len(index)} resumes in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        index.add(f"new-{i}", rng.sample(vocab, 15))
+    print(f"incremental add: {(time.perf_counter() - start) * 1000 / 1000:.3f} ms/resume")
+
+    timings = []
+    for _ in range(queries):
+        jd = rng.sample(vocab, rng.randint(5, 30))
+        start = time.perf_counter()
+        index.query(jd, k)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    print(f"query top-{k}: p50 {timings[len(timings) // 2]:.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms, max {timings[-1]:.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.resumes, args.k, args.queries, args.seed)
@@ -0,0 +1,42 @@
+"""
+Time vectorized gap scoring of a resumes x JDs grid.
+
+    python benchmarks/bench_skill_vectors.py [--resumes 10000] [--jds 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from skill_vectors import default_vocabulary, score_matrix
+
+def run(n_resumes, n_jds, seed):
+    rng = random.Random(seed)
+    vocab = default_vocabulary()
+    names = list(vocab.names)
+
+    resume_rows = vocab.encode_many(rng.sample(names, rng.randint(5, 25)) for _ in range(n_resumes))
+    jd_rows = vocab.encode_many(rng.sample(names, rng.randint(5, 30)) for _ in range(n_jds))
+    adjacency = vocab.partial_adjacency()
+
+    start = time.perf_counter()
+    scores = score_matrix(resume_rows, jd_rows, vocab, adjacency)
+    elapsed = time.perf_counter() - start
+
+    pairs = n_resumes * n_jds
+    print(f"vocabulary: {len(vocab)} skills")
+    print(f"scored {n_resumes} x {n_jds} = {pairs} pairs in {elapsed:.3f}s "
+          f"({pairs / elapsed / 1e6:.1f}M pairs/s)")
+    print(f"mean overall match: {scores['overall_match'].mean():.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--jds", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.resumes, args.jds, args.seed)
@@ -0,0 +1,71 @@
+"""
+Import-time budget check for the landing page.
+
+Runs app_final.py headlessly with nothing uploaded (Streamlit AppTest) in
+this fresh interpreter, then fails if the app imported any plotting,
+dataframe, DOCX or PDF library, or if the cold run took longer than the
+budget. Modules Streamlit imports on its own are reported but not counted.
+
+    python benchmarks/check_landing_imports.py [--budget SECONDS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Only needed once a file is uploaded / a chart is drawn / a report exported
+FORBIDDEN = [
+    "matplotlib",
+    "plotly.graph_objects",
+    "pandas",
+    "pdfplumber",
+    "pdfminer",
+    "docx",
+    "fpdf",
+]
+
+def _loaded(names):
+    return {
+        name for name in names
+        if name in sys.modules or any(m.startswith(name + ".") for m in sys.modules)
+    }
+
+def run(budget):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    # Whatever Streamlit itself drags in is not the app's fault
+    baseline = _loaded(FORBIDDEN)
+    if baseline:
+        print(f"note: streamlit itself imports {', '.join(sorted(baseline))}")
+
+    app = AppTest.from_file(os.path.join(ROOT, "app_final.py"), default_timeout=60)
+    app.run()
+    elapsed = time.perf_counter() - start
+
+    if app.exception:
+        print(f"FAIL: landing page raised {app.exception[0].message}")
+        return 1
+
+    loaded = sorted(_loaded(FORBIDDEN) - baseline)
+    status = 0
+    if loaded:
+        print(f"FAIL: landing page imported {', '.join(loaded)}")
+        status = 1
+    if elapsed > budget:
+        print(f"FAIL: cold landing run took {elapsed:.2f}s (budget {budget:.2f}s)")
+        status = 1
+    if status == 0:
+        print(f"OK: cold landing run {elapsed:.2f}s, no heavy imports")
+    return status
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=float, default=3.0)
+    args = parser.parse_args()
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    sys.exit(run(args.budget))
@@ -0,0 +1,153 @@
+"""
+Load-test a local analysis_service instance.
+
+N client threads, each on its own keep-alive connection, send /analyze
+requests (synthetic resumes against one JD precompiled through /jd) for a
+fixed duration, then report requests/sec, p50/p95/p99 latency of successful
+requests and the status-code mix (429 = backpressure, 504 = timeout).
+
+    python benchmarks/load_test_service.py [--url http://127.0.0.1:8765]
+        [--concurrency 16] [--duration 10] [--spawn --workers 4]
+
+--spawn starts the service on the given port first and stops it afterwards.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+sys.path.insert(0, ROOT)
+
+def synthetic_resumes(n, seed):
+    from skill_analysis import SOFT_SKILLS, TECHNICAL_SKILLS
+
+    rng = random.Random(seed)
+    resumes = [
+        f"Candidate {i}\nlinkedin.com/in/candidate{i}\nTECHNICAL SKILLS\n"
+        f"{', '.join(rng.sample(TECHNICAL_SKILLS, 15))}\nSoft Skills\n{', '.join(rng.sample(SOFT_SKILLS, 3))}\n"
+        for i in range(n)
+    ]
+    jd = "Requirements: " + ", ".join(rng.sample(TECHNICAL_SKILLS, 25))
+    return resumes, jd
+
+def request(conn, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read() or b"{}")
+
+def wait_until_up(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            request(conn, "GET", "/health")
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+def client(host, port, jd_id, resumes, deadline, latencies, statuses, lock, seed):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    local_latencies = []
+    local_statuses = Counter()
+    while time.monotonic() < deadline:
+        payload = {"resume_text": rng.choice(resumes), "jd_id": jd_id}
+        start = time.perf_counter()
+        try:
+            status, _ = request(conn, "POST", "/analyze", payload)
+        except (OSError, http.client.HTTPException):
+            local_statuses["connection error"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=60)
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        local_statuses[status] += 1
+        if status == 200:
+            local_latencies.append(elapsed)
+        elif status == 429:
+            time.sleep(0.01)  # honour backpressure a little, like a real client
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))] if values else float("nan")
+
+def run(url, concurrency, duration, seed):
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+
+    resumes, jd = synthetic_resumes(200, seed)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    status, body = request(conn, "POST", "/jd", {"jd_text": jd})
+    conn.close()
+    if status != 200:
+        print(f"FAIL: /jd returned {status}: {body}")
+        return 1
+    jd_id = body["jd_id"]
+
+    latencies, statuses, lock = [], Counter(), threading.Lock()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=client, args=(host, port, jd_id, resumes, deadline, latencies, statuses, lock, seed + i))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = sum(statuses.values())
+    print(f"{concurrency} clients x {duration:g}s against {url}")
+    print(f"requests: {total} ({total / elapsed:.1f}/s), ok: {statuses[200]} ({statuses[200] / elapsed:.1f}/s)")
+    print(f"latency ms (200 only): p50 {percentile(latencies, 0.50):.1f}, "
+          f"p95 {percentile(latencies, 0.95):.1f}, p99 {percentile(latencies, 0.99):.1f}")
+    print("status codes: " + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items(), key=str)))
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start analysis_service.py for the test")
+    parser.add_argument("--workers", type=int, default=4, help="service workers with --spawn")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        parsed = urlparse(args.url)
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, "analysis_service.py"), "--host", parsed.hostname,
+             "--port", str(parsed.port or 80), "--workers", str(args.workers), "--no-store"],
+            cwd=ROOT,
+        )
+        if not wait_until_up(parsed.hostname, parsed.port or 80):
+            server.terminate()
+            sys.exit("service did not come up")
+    try:
+        status = run(args.url, args.concurrency, args.duration, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    sys.exit(status)
@@ -0,0 +1,198 @@
+"""
+Skill Gap AI - dashboard figures and tables.
+
+Plotly figure, dataframe and HTML builders that don't depend on Streamlit,
+so they can be reused and benchmarked headlessly. plotly and pandas are
+imported inside each builder to keep them off the landing page.
+"""
+
+import html
+
+from skill_analysis import SOFT_SKILLS, TAXONOMY, display_skill, normalize_skill
+
+SOFT_SKILL_SET = frozenset(SOFT_SKILLS)
+
+# Above this many JD skills the matrix is drawn with WebGL (Scattergl)
+WEBGL_THRESHOLD = 200
+
+STATUS_ORDER = ("exact", "partial", "missing")
+
+STATUS_ROW = {
+    "exact": "✅ Exact Match",
+    "partial": "🟡 Partial Match",
+    "missing": "❌ Missing"
+}
+
+COLOR_MAP = {
+    "exact": "green",
+    "partial": "orange",
+    "missing": "red"
+}
+
+SIZE_MAP = {
+    "exact": 26,
+    "partial": 22,
+    "missing": 16
+}
+
+# ================= SIMILARITY MATRIX =================
+
+def similarity_matrix_rows(jd_skills, resume_skill_names, resume_skill_map):
+    """
+    One (display name, status, matched resume skill or None) row per JD skill,
+    in sorted JD-skill order. Same rules as get_match_status /
+    get_soft_skill_status, with the resume names normalized once.
+    """
+    resume_norms = {normalize_skill(r) for r in resume_skill_names}
+    resume_map_norms = set(resume_skill_map)
+
+    rows = []
+    for jd_skill in sorted(jd_skills):
+        if jd_skill in SOFT_SKILL_SET:
+            status = TAXONOMY.soft_match_status(jd_skill, resume_norms)
+        else:
+            status = TAXONOMY.match_status(jd_skill, resume_norms)
+
+        matched_resume_skill = None
+        # Exact match → same skill
+        if status == "exact":
+            matched_resume_skill = display_skill(jd_skill)
+        # Partial match → controlled synonym match
+        elif status == "partial":
+            r = TAXONOMY.partial_match_for(jd_skill, resume_map_norms)
+            if r:
+                matched_resume_skill = resume_skill_map.get(r, r)
+
+        rows.append((display_skill(jd_skill), status, matched_resume_skill))
+    return rows
+
+def similarity_matrix_figure(rows, webgl_threshold=WEBGL_THRESHOLD):
+    """
+    JD skills x match status scatter: one trace per status, with the hover
+    text carried in customdata instead of being baked into a template per
+    skill. Switches to Scattergl above webgl_threshold skills.
+    """
+    import plotly.graph_objects as go
+
+    scatter = go.Scattergl if len(rows) > webgl_threshold else go.Scatter
+    fig = go.Figure()
+
+    for status in STATUS_ORDER:
+        names = [name for name, s, _ in rows if s == status]
+        if not names:
+            continue
+        resume_hits = [hit for _, s, hit in rows if s == status]
+
+        fig.add_trace(scatter(
+            x=names,
+            y=[STATUS_ROW[status]] * len(names),
+            mode="markers+text" if status == "partial" else "markers",
+            text=[hit or "" for hit in resume_hits] if status == "partial" else None,
+            textposition="top center",
+            customdata=[hit or "—" for hit in resume_hits],
+            marker=dict(
+                size=SIZE_MAP[status],
+                color=COLOR_MAP[status],
+                line=dict(color="black", width=1)
+            ),
+            hovertemplate=(
+                "<b>JD Skill:</b> %{x}<br>"
+                "<b>Status:</b> " + STATUS_ROW[status] + "<br>"
+                "<b>Matched Resume Skill:</b> %{customdata}"
+                "<extra></extra>"
+            ),
+            showlegend=False
+        ))
+
+    fig.update_layout(
+        height=380,
+        plot_bgcolor="white",
+        margin=dict(l=120, r=40, t=30, b=80),
+        xaxis=dict(
+            title="<b>Job Description Skills</b>",
+            tickangle=45,
+            showgrid=True,
+            gridcolor="lightgray",
+            # Traces are grouped by status; keep the JD skills in sorted order
+            categoryorder="array",
+            categoryarray=list(dict.fromkeys(name for name, _, _ in rows))
+        ),
+        yaxis=dict(
+            title="<b>Match Status</b>",
+            categoryorder="array",
+            categoryarray=[STATUS_ROW[s] for s in STATUS_ORDER],
+            showgrid=True,
+            gridcolor="lightgray"
+        ),
+        showlegend=False
+    )
+    return fig
+
+# ================= SKILL COMPARISON =================
+
+# status -> (label, percent, colour, badge background)
+COMPARISON_STYLE = {
+    "matched": ("Perfect Match", 100, "#22C55E", "#DCFCE7"),   # green
+    "partial": ("Partial Match", 50, "#F59E0B", "#FEF3C7"),    # yellow
+    "missing": ("Missing", 20, "#EF4444", "#FEE2E2"),          # red
+    "extra": ("Resume Extra", 30, "#3B82F6", "#FFEDD5"),       # blue on orange - resume only
+}
+
+STATUS_ICON = {
+    "matched": "🟢",
+    "partial": "🟡",
+    "missing": "🔴",
+    "extra": "🔵"
+}
+
+def comparison_statuses(all_skills, jd_skill_names, matched, partial):
+    """Comparison status ("matched" / "partial" / "missing" / "extra") per skill"""
+    jd_set = {normalize_skill(s) for s in jd_skill_names}
+    statuses = []
+    for skill in all_skills:
+        norm = normalize_skill(skill)
+        if norm not in jd_set:
+            statuses.append("extra")
+        elif norm in matched:
+            statuses.append("matched")
+        elif norm in partial:
+            statuses.append("partial")
+        else:
+            statuses.append("missing")
+    return statuses
+
+def skill_comparison_frame(all_skills, statuses):
+    """Skill / Status / Match % table for the Skill Comparison section"""
+    import pandas as pd
+
+    return pd.DataFrame({
+        "Skill": [s.title() for s in all_skills],
+        "Status": [f"{STATUS_ICON[s]} {COMPARISON_STYLE[s][0]}" for s in statuses],
+        "Match": [COMPARISON_STYLE[s][1] for s in statuses],
+    })
+
+def match_badges_html(all_skills, statuses, columns=6, max_height=420):
+    """
+    Every Key Skill Match Percentages badge in one scrollable HTML grid, so
+    the section is a single element however many skills there are.
+    """
+    badges = []
+    for skill, status in zip(all_skills, statuses):
+        _, percent, fg, bg = COMPARISON_STYLE[status]
+        badges.append(
+            '<div>'
+            f'<div style="background:{bg};width:80px;height:80px;border-radius:50%;'
+            f'display:flex;align-items:center;justify-content:center;margin:auto;border:3px solid {fg};">'
+            f'<b style="color:{fg};font-size:18px;">{percent}%</b>'
+            '</div>'
+            f'<p style="text-align:center;margin-top:6px;font-size:11px;"><b>{html.escape(skill.title())}</b></p>'
+            '</div>'
+        )
+
+    columns = max(1, min(len(badges), columns))
+    return (
+        f'<div style="display:grid;grid-template-columns:repeat({columns}, 1fr);gap:8px;'
+        f'max-height:{max_height}px;overflow-y:auto;">'
+        + "".join(badges)
+        + '</div>'
+    )
@@ -0,0 +1,319 @@
+"""
+Skill Gap AI - persistent parsed-document store.
+
+SQLite file that keeps what the pipeline produced for each uploaded
+document (cleaned text, merged skills, contact details) so a server restart
+doesn't throw the work away. Rows are keyed by content hash, file type and
+extractor version; skills are additionally tagged with the taxonomy version
+and ignored once the skill lists change. Single PDF pages are kept the same
+way (raw text and the skills found on them, keyed by page fingerprint and
+backend) so a revised resume only re-reads the pages that changed. Total
+size is bounded and the least recently used rows of either table are
+evicted first; rows of an older extractor version are deleted as soon as a
+new version opens the file.
+
+Several server processes can share one file: the database runs in WAL mode,
+every write is a short IMMEDIATE transaction, and readers wait on locks
+instead of failing. A forked child opens its own connection rather than
+using the one it inherited.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_hash          TEXT NOT NULL,
+    file_type         TEXT NOT NULL,
+    extractor_version TEXT NOT NULL,
+    taxonomy_version  TEXT NOT NULL,
+    text              TEXT NOT NULL,
+    skills            TEXT NOT NULL,
+    name              TEXT NOT NULL,
+    linkedin          TEXT NOT NULL,
+    size              INTEGER NOT NULL,
+    last_access       REAL NOT NULL,
+    contact           TEXT NOT NULL DEFAULT '',
+    pages             TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (doc_hash, file_type, extractor_version)
+);
+CREATE INDEX IF NOT EXISTS documents_last_access ON documents (last_access);
+CREATE TABLE IF NOT EXISTS pages (
+    page_hash         TEXT NOT NULL,
+    backend           TEXT NOT NULL,
+    extractor_version TEXT NOT NULL,
+    taxonomy_version  TEXT NOT NULL,
+    text              TEXT NOT NULL,
+    skills            TEXT NOT NULL,
+    size              INTEGER NOT NULL,
+    last_access       REAL NOT NULL,
+    PRIMARY KEY (page_hash, backend, extractor_version)
+);
+CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access);
+CREATE TABLE IF NOT EXISTS store_size (
+    id                INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes             INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key               TEXT PRIMARY KEY,
+    value             TEXT NOT NULL
+);
+"""
+
+# Running total of the size column of both tables: writes keep it up to
+# date, so eviction never has to sum the whole store
+TOTAL_SIZE = "(SELECT COALESCE(SUM(size), 0) FROM documents) + (SELECT COALESCE(SUM(size), 0) FROM pages)"
+
+class _Connection(sqlite3.Connection):
+    """sqlite3 connection that can be weakly referenced (see _live_connections)"""
+
+# Every connection open in this process. A connection must not be carried
+# across fork(): a child marks the ones it inherited as unusable and opens
+# its own. It never closes them either, because closing a file descriptor
+# drops every POSIX lock the process holds on that file, including those
+# of its own connection. So they are only kept referenced.
+_live_connections = weakref.WeakSet()
+_inherited_connections = []
+
+def _after_fork_in_child():
+    _inherited_connections.extend(_live_connections)
+    _live_connections.clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+# Columns added to documents after the first release, with their definitions
+ADDED_COLUMNS = {
+    "contact": "TEXT NOT NULL DEFAULT ''",
+    "pages": "TEXT NOT NULL DEFAULT ''",
+}
+
+class DocumentStore:
+    """SQLite-backed store of parsed documents, safe across threads and processes"""
+
+    def __init__(self, path, extractor_version, taxonomy_version, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.extractor_version = extractor_version
+        self.taxonomy_version = taxonomy_version
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        # Files created before these columns existed
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(documents)")}
+        for column, definition in ADDED_COLUMNS.items():
+            if column not in columns:
+                try:
+                    conn.execute(f"ALTER TABLE documents ADD COLUMN {column} {definition}")
+                except sqlite3.OperationalError:
+                    pass  # another process added it first
+        # Files created before the running total existed: summed once
+        conn.execute(f"INSERT OR IGNORE INTO store_size SELECT 0, {TOTAL_SIZE} "
+                     "WHERE NOT EXISTS (SELECT 1 FROM store_size)")
+        # Rows of another extractor version are never read again but would
+        # count towards max_bytes: drop them when this version first opens the file
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'extractor_version'").fetchone()
+        if row is None or row[0] != extractor_version:
+            self.purge_stale()
+
+    def _connect(self):
+        # sqlite3 connections can't be shared between threads, nor with a
+        # forked child: one per thread, reopened when the process changes
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None,
+                                   factory=_Connection)
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            _live_connections.add(conn)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, doc_hash, file_type):
+        """
+        Return the stored record as a dict, or None. When the row was written
+        under another taxonomy version, "skills" is None so the caller can
+        re-extract them from the (still valid) text; "contact" is None for
+        rows written before contact details were stored. "pages" holds the
+        PDF page fingerprints ([] for other files and older rows).
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT taxonomy_version, text, skills, name, linkedin, contact, pages FROM documents "
+            "WHERE doc_hash = ? AND file_type = ? AND extractor_version = ?",
+            (doc_hash, file_type, self.extractor_version),
+        ).fetchone()
+        if row is None:
+            return None
+
+        conn.execute(
+            "UPDATE documents SET last_access = ? "
+            "WHERE doc_hash = ? AND file_type = ? AND extractor_version = ?",
+            (time.time(), doc_hash, file_type, self.extractor_version),
+        )
+
+        taxonomy_version, text, skills, name, linkedin, contact, pages = row
+        return {
+            "text": text,
+            "skills": json.loads(skills) if taxonomy_version == self.taxonomy_version else None,
+            "name": name,
+            "linkedin": linkedin,
+            "contact": json.loads(contact) if contact else None,
+            "pages": json.loads(pages) if pages else [],
+        }
+
+    def put(self, doc_hash, file_type, text, skills, contact, pages=()):
+        """contact: {"name", "linkedin", "email", "phone", "github"}; pages: page fingerprints"""
+        skills_json = json.dumps(skills)
+        contact_json = json.dumps(contact)
+        pages_json = json.dumps(list(pages))
+        name, linkedin = contact.get("name", "Candidate"), contact.get("linkedin", "")
+        size = len(text) + len(skills_json) + len(contact_json) + len(pages_json)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            replaced = conn.execute(
+                "SELECT size FROM documents WHERE doc_hash = ? AND file_type = ? AND extractor_version = ?",
+                (doc_hash, file_type, self.extractor_version),
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO documents "
+                "(doc_hash, file_type, extractor_version, taxonomy_version, text, skills, "
+                "name, linkedin, size, last_access, contact, pages) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (doc_hash, file_type, self.extractor_version, self.taxonomy_version,
+                 text, skills_json, name, linkedin, size, time.time(), contact_json, pages_json),
+            )
+            self._evict(conn, size - (replaced[0] if replaced else 0))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ================= PAGES =================
+
+    def get_pages(self, page_hashes, backend):
+        """
+        {page_hash: {"text", "skills"}} for the stored pages among
+        `page_hashes` read with `backend`; "skills" is None when the row was
+        written under another taxonomy version.
+        """
+        page_hashes = list(dict.fromkeys(page_hashes))
+        if not page_hashes:
+            return {}
+        conn = self._connect()
+        marks = ", ".join("?" * len(page_hashes))
+        rows = conn.execute(
+            f"SELECT page_hash, taxonomy_version, text, skills FROM pages "
+            f"WHERE backend = ? AND extractor_version = ? AND page_hash IN ({marks})",
+            (backend, self.extractor_version, *page_hashes),
+        ).fetchall()
+        if rows:
+            conn.execute(
+                f"UPDATE pages SET last_access = ? "
+                f"WHERE backend = ? AND extractor_version = ? AND page_hash IN ({', '.join('?' * len(rows))})",
+                (time.time(), backend, self.extractor_version, *(row[0] for row in rows)),
+            )
+        return {
+            page_hash: {
+                "text": text,
+                "skills": json.loads(skills) if taxonomy_version == self.taxonomy_version else None,
+            }
+            for page_hash, taxonomy_version, text, skills in rows
+        }
+
+    def put_pages(self, backend, pages):
+        """pages: (page_hash, raw text, skills found on the page) tuples, written in one transaction"""
+        rows = []
+        now = time.time()
+        for page_hash, text, skills in pages:
+            skills_json = json.dumps(skills)
+            rows.append((page_hash, backend, self.extractor_version, self.taxonomy_version,
+                         text, skills_json, len(text) + len(skills_json), now))
+        if not rows:
+            return
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            marks = ", ".join("?" * len(rows))
+            replaced = conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM pages "
+                f"WHERE backend = ? AND extractor_version = ? AND page_hash IN ({marks})",
+                (backend, self.extractor_version, *dict.fromkeys(row[0] for row in rows)),
+            ).fetchone()[0]
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages "
+                "(page_hash, backend, extractor_version, taxonomy_version, text, skills, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            added = sum(size for size in {row[0]: row[6] for row in rows}.values())
+            self._evict(conn, added - replaced)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ================= MAINTENANCE =================
+
+    def _evict(self, conn, grown):
+        """
+        Add `grown` bytes to the running total, then drop least recently used
+        rows (documents or pages) until the store fits in max_bytes. Runs
+        inside the caller's write transaction.
+        """
+        total = conn.execute("UPDATE store_size SET bytes = bytes + ? RETURNING bytes", (grown,)).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = {"documents": [], "pages": []}
+        for table, rowid, size, _ in conn.execute(
+            "SELECT 'documents', rowid, size, last_access FROM documents "
+            "UNION ALL SELECT 'pages', rowid, size, last_access FROM pages ORDER BY last_access"
+        ):
+            doomed[table].append((rowid,))
+            freed += size
+            if freed >= excess:
+                break
+        for table, rowids in doomed.items():
+            conn.executemany(f"DELETE FROM {table} WHERE rowid = ?", rowids)
+        conn.execute("UPDATE store_size SET bytes = bytes - ?", (freed,))
+
+    def purge_stale(self):
+        """
+        Delete rows written by other extractor versions. Rows of another
+        taxonomy version stay: their text is reused and only re-scanned.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("documents", "pages"):
+                conn.execute(f"DELETE FROM {table} WHERE extractor_version != ?", (self.extractor_version,))
+            conn.execute(f"UPDATE store_size SET bytes = {TOTAL_SIZE}")
+            conn.execute("INSERT OR REPLACE INTO store_meta VALUES ('extractor_version', ?)",
+                         (self.extractor_version,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def stats(self):
+        count, size, pages, pages_size = self._connect().execute(
+            "SELECT (SELECT COUNT(*) FROM documents), (SELECT COALESCE(SUM(size), 0) FROM documents), "
+            "(SELECT COUNT(*) FROM pages), (SELECT COALESCE(SUM(size), 0) FROM pages)"
+        ).fetchone()
+        return {"documents": count, "pages": pages, "bytes": size + pages_size, "max_bytes": self.max_bytes}
@@ -0,0 +1,148 @@
+"""
+Skill Gap AI - per-stage latency instrumentation.
+
+Wrap a pipeline stage in `with stage("merge"):` (or decorate a function with
+@timed("merge")) to record its wall time, CPU time and, while memory tracing
+is on, its peak Python allocation. Every finished stage is
+
+- appended to the calling thread's collector (see collect()), which is what
+  the dashboard's debug panel shows, and
+- logged as one JSON line on the "skill_gap.timing" logger, so production
+  logs can be aggregated into per-stage percentiles.
+
+CPU time is the calling thread's (time.thread_time), so work done in the
+PDF process pool shows up as wall time only. Peak allocation comes from
+tracemalloc, which is process-wide and slows allocation down noticeably:
+it is off unless trace_memory(True) is called or SKILL_GAP_TRACE_MEMORY=1,
+and numbers are approximate when several sessions run at once. Once on it
+stays on for the whole process, so only the operator should turn it on
+(environment variables, never a request parameter).
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+logger = logging.getLogger("skill_gap.timing")
+
+_local = threading.local()
+
+@dataclass(frozen=True)
+class StageTiming:
+    """One finished stage"""
+    stage: str
+    wall_ms: float
+    cpu_ms: float
+    peak_kb: float = None   # None when memory tracing is off
+    attrs: dict = field(default_factory=dict)
+
+    def as_dict(self):
+        return {
+            "stage": self.stage,
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "peak_kb": None if self.peak_kb is None else round(self.peak_kb, 1),
+            **self.attrs,
+        }
+
+# ================= MEMORY TRACING =================
+
+def trace_memory(enabled=True):
+    """Start / stop tracemalloc for peak-allocation numbers"""
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+if os.environ.get("SKILL_GAP_TRACE_MEMORY") == "1":
+    trace_memory(True)
+
+# ================= COLLECTION =================
+
+def collect():
+    """
+    Start a fresh list of StageTiming records for this thread (e.g. one
+    Streamlit script run) and return it; finished stages are appended to it.
+    """
+    _local.records = []
+    return _local.records
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+class stage:
+    """Context manager timing one pipeline stage; extra keyword args are logged with it"""
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.child_peak = 0
+
+    def __enter__(self):
+        stack = _stack()
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Nested stages reset the peak; hand what we've seen so far to the parent
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+        stack.append(self)
+        self.start_cpu = time.thread_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall_ms = (time.perf_counter() - self.start_wall) * 1000
+        cpu_ms = (time.thread_time() - self.start_cpu) * 1000
+
+        stack = _stack()
+        stack.pop()
+        peak_kb = None
+        if self.tracing and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            peak_kb = max(0, peak - self.start_memory) / 1024
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+
+        record = StageTiming(self.name, wall_ms, cpu_ms, peak_kb, self.attrs)
+        records = getattr(_local, "records", None)
+        if records is not None:
+            records.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"event": "stage", **record.as_dict()}, default=str))
+        return False
+
+def timed(name):
+    """Decorator form of stage()"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# ================= LOGGING =================
+
+def log_to_stderr():
+    """Print the JSON timing lines on stderr (once, however often it's called)"""
+    if any(getattr(h, "_skill_gap_timing", False) for h in logger.handlers):
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler._skill_gap_timing = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
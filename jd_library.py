@@ -0,0 +1,250 @@
+"""
+Skill Gap AI - best-fit roles for one resume across a library of JDs.
+
+A JDLibrary keeps every job description as a boolean row over the shared
+skill vocabulary (skill_vectors.default_vocabulary, grown by any JD-only
+skills). Ranking a resume is one pass of score_matrix over the whole
+library: the resume is parsed and encoded once, and exact / partial /
+missing counts for every JD come out of two matrix products, with the same
+rules as get_match_status. Only the top-N rows are decoded into skill names.
+
+    python jd_library.py build jds/ --out jd_library.npz
+    python jd_library.py rank resume.pdf --library jd_library.npz --top 10
+
+Roles are ordered by overall match %, then partial matches. A role's "top
+missing" skills are the ones it asks for that the resume lacks, most
+in-demand across the library first.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+import skill_analysis
+from skill_analysis import display_skill, parse_document
+from skill_vectors import (
+    SkillVocabulary,
+    default_vocabulary,
+    pack_rows,
+    pad_rows,
+    partial_coverage,
+    score_matrix,
+    unpack_rows,
+)
+
+JD_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+class JDLibrary:
+    """Append-only set of JDs encoded over one vocabulary, ranked in bulk"""
+
+    def __init__(self, vocab=None):
+        self.vocab = vocab if vocab is not None else default_vocabulary()
+        self.jd_ids = []
+        self.titles = []
+        self._rows = []          # rows added since the matrix was last built
+        self._matrix = np.zeros((0, len(self.vocab)), dtype=bool)
+        self._matrix_f32 = None
+        self._adjacency = None
+        self._demand = None
+
+    def __len__(self):
+        return len(self.jd_ids)
+
+    def add(self, jd_id, skills, title=""):
+        """Add one JD (merged skill dicts or names); new skills grow the vocabulary"""
+        self._rows.append(self.vocab.encode(skills, grow=True))
+        self.jd_ids.append(jd_id)
+        self.titles.append(title)
+        self._demand = None
+
+    def add_many(self, items):
+        """items: (jd_id, skills[, title]) tuples"""
+        for item in items:
+            self.add(*item)
+
+    # ================= MATRIX =================
+
+    @property
+    def matrix(self):
+        """(len(self), len(self.vocab)) boolean JD matrix, built on first use"""
+        width = len(self.vocab)
+        if self._rows or self._matrix.shape[1] != width:
+            rows = [pad_rows(self._matrix, width)] + [pad_rows(r[None, :], width) for r in self._rows]
+            self._matrix = np.vstack(rows)
+            self._matrix_f32 = None
+            self._rows = []
+        return self._matrix
+
+    @property
+    def matrix_f32(self):
+        """The JD matrix as float32 for score_matrix, converted once per rebuild"""
+        matrix = self.matrix
+        if self._matrix_f32 is None:
+            self._matrix_f32 = matrix.astype(np.float32)
+        return self._matrix_f32
+
+    @property
+    def adjacency(self):
+        if self._adjacency is None or self._adjacency.shape[0] != len(self.vocab):
+            self._adjacency = self.vocab.partial_adjacency()
+        return self._adjacency
+
+    @property
+    def demand(self):
+        """How many JDs in the library ask for each vocabulary skill"""
+        if self._demand is None:
+            self._demand = self.matrix.sum(axis=0)
+        return self._demand
+
+    # ================= RANKING =================
+
+    def rank(self, resume_skills, top=10, missing=5):
+        """
+        The `top` best-fitting JDs for one resume (merged skill dicts or
+        names), best first. Each hit has the JD id and title, overall match
+        %, exact / partial / missing counts and up to `missing` top missing
+        skills.
+        """
+        jds = self.matrix
+        if not len(jds) or top <= 0:
+            return []
+
+        resume_row = self.vocab.encode(resume_skills, grow=False)[None, :]
+        scores = score_matrix(resume_row, self.matrix_f32, self.vocab, self.adjacency)
+        overall = scores["overall_match"][0].astype(np.int64)
+        partial = scores["partial"][0].astype(np.int64)
+
+        # One sortable key per JD: overall %, then partial count, then
+        # library order, so ties are broken the same way at the cut-off too
+        n = len(jds)
+        key = (overall * (jds.shape[1] + 1) + partial) * n + np.arange(n - 1, -1, -1)
+        top = min(top, n)
+        candidates = np.argpartition(-key, top - 1)[:top]
+        order = candidates[np.argsort(-key[candidates])]
+
+        # Decode missing skills for the winners only
+        lacking = jds[order] & ~resume_row & ~partial_coverage(resume_row, self.adjacency)
+        demand = self.demand
+        hits = []
+        for i, row in zip(order, lacking):
+            ids = np.flatnonzero(row)
+            ids = ids[np.lexsort((ids, -demand[ids]))][:missing]
+            hits.append({
+                "jd_id": self.jd_ids[i],
+                "title": self.titles[i],
+                "overall_match": int(overall[i]),
+                "exact": int(scores["exact"][0, i]),
+                "partial": int(partial[i]),
+                "missing": int(scores["missing"][0, i]),
+                "top_missing": [self.vocab.names[j] for j in ids],
+            })
+        return hits
+
+    # ================= PERSISTENCE =================
+
+    def save(self, path):
+        """Packed rows plus vocabulary and ids in one .npz file"""
+        np.savez_compressed(
+            path,
+            rows=pack_rows(self.matrix),
+            vocab=np.array(self.vocab.names, dtype=str),
+            jd_ids=np.array(self.jd_ids, dtype=str),
+            titles=np.array(self.titles, dtype=str),
+            skills_version=np.array(skill_analysis.SKILLS_VERSION),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """ValueError when the library was built with a different taxonomy or extractor"""
+        with np.load(path) as data:
+            if str(data["skills_version"]) != skill_analysis.SKILLS_VERSION:
+                raise ValueError(f"{path} was built with a different skill taxonomy or extractor; rebuild it")
+            library = cls(SkillVocabulary(data["vocab"].tolist()))
+            library.jd_ids = data["jd_ids"].tolist()
+            library.titles = data["titles"].tolist()
+            library._matrix = unpack_rows(data["rows"], len(library.vocab))
+        return library
+
+# ================= CLI =================
+
+def _find_jds(root):
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(JD_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return sorted(found)
+
+def build(jd_dir, out_path):
+    library = JDLibrary()
+    start = time.perf_counter()
+    for path in _find_jds(jd_dir):
+        with open(path, "rb") as f:
+            doc = parse_document(f.read())
+        if doc.error:
+            print(f"skipping {path}: {doc.error}", file=sys.stderr)
+            continue
+        if doc.truncated:
+            # A partial JD would be ranked against every later resume
+            print(f"skipping {path}: time limit hit after {len(doc.pages)} page(s); build again to retry",
+                  file=sys.stderr)
+            continue
+        # A JD's first line is usually the role title
+        title = next((line.strip() for line in doc.text.splitlines() if line.strip()), "")[:80]
+        library.add(os.path.relpath(path, jd_dir), doc.skills, title)
+    library.save(out_path)
+    print(f"{len(library)} JDs over {len(library.vocab)} skills -> {out_path} "
+          f"in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 0
+
+def rank(resume_path, library_path, top, missing, as_json):
+    library = JDLibrary.load(library_path)
+    with open(resume_path, "rb") as f:
+        doc = parse_document(f.read())
+    if doc.error:
+        print(f"could not read resume: {doc.error}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    hits = library.rank(doc.skills, top, missing)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if as_json:
+        for hit in hits:
+            print(json.dumps(hit, ensure_ascii=False))
+    else:
+        for n, hit in enumerate(hits, 1):
+            gaps = ", ".join(display_skill(s) for s in hit["top_missing"]) or "-"
+            print(f"{n:>3}. {hit['overall_match']:>3}%  {hit['jd_id']}  {hit['title']}  "
+                  f"({hit['exact']} matched, {hit['partial']} partial, {hit['missing']} missing; lacks: {gaps})")
+    print(f"ranked {len(library)} JDs in {elapsed_ms:.1f} ms", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank a library of job descriptions for one resume")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_cmd = commands.add_parser("build", help="parse a directory of JDs into a library file")
+    build_cmd.add_argument("jd_dir", help="directory searched recursively for .pdf/.docx/.txt JDs")
+    build_cmd.add_argument("--out", default="jd_library.npz")
+
+    rank_cmd = commands.add_parser("rank", help="best-fitting JDs for one resume")
+    rank_cmd.add_argument("resume", help="resume file (.pdf/.docx/.txt)")
+    rank_cmd.add_argument("--library", default="jd_library.npz")
+    rank_cmd.add_argument("--top", type=int, default=10)
+    rank_cmd.add_argument("--missing", type=int, default=5, help="top missing skills shown per role")
+    rank_cmd.add_argument("--json", action="store_true", help="one JSON line per role")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        if not os.path.isdir(args.jd_dir):
+            parser.error(f"not a directory: {args.jd_dir}")
+        return build(args.jd_dir, args.out)
+    return rank(args.resume, args.library, args.top, args.missing, args.json)
+
+if __name__ == "__main__":
+    sys.exit(main())
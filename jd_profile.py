@@ -0,0 +1,244 @@
+"""
+Skill Gap AI - precompiled job-description profiles.
+
+A JDProfile is everything scoring needs from a job description, worked out
+once: its skills as canonical (normalized) names, the resume skills that
+make each of them a partial match, and which of them are soft skills. After
+that, scoring a resume is its own extraction plus a couple of NumPy
+lookups, with the same results as compute_skill_gap.
+
+    profile = cached_profile(jd_bytes)          # parsed once, then from disk
+    profile.gap(resume_skill_names)             # {"overall_match", "matched", ...}
+
+Profiles are small JSON files tied to SKILLS_VERSION (taxonomy + extraction
+rules); a profile built under another one is rejected on load and rebuilt.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from skill_analysis import (
+    SKILLS_VERSION,
+    TAXONOMY,
+    content_hash,
+    normalize_skill,
+    parse_document,
+    parse_text,
+)
+from skill_vectors import SkillVocabulary
+
+PROFILE_FORMAT = 2
+PROFILE_DIR = os.environ.get("SKILL_GAP_JD_PROFILES", os.path.join(".skill_gap_cache", "jd_profiles"))
+
+class JDProfile:
+    """Compiled, serializable view of one job description's skills"""
+
+    truncated = False   # the JD's PDF hit the time budget: never saved or cached
+
+    def __init__(self, skills, soft=(), jd_hash="", skills_version=SKILLS_VERSION):
+        # Canonical ids: a skill's position in the sorted list of normalized names
+        self.skills = tuple(sorted({normalize_skill(s) for s in skills}))
+        self.soft = frozenset(normalize_skill(s) for s in soft) & frozenset(self.skills)
+        self.jd_hash = jd_hash
+        self.skills_version = skills_version
+
+        # Synonym expansions: resume skills that make each JD skill partial.
+        # get_match_status rules for every skill (what the overall match
+        # uses); get_soft_skill_status rules for the soft ones on request.
+        self.expansions = tuple(TAXONOMY.partial_matches.get(s, frozenset()) for s in self.skills)
+        self.soft_expansions = tuple(
+            TAXONOMY.soft_partial_matches.get(s, frozenset()) if s in self.soft else frozenset()
+            for s in self.skills
+        )
+
+        # Local vocabulary: the JD skills first (ids 0..n-1), then every
+        # expansion name. Resume skills outside it can't affect the score.
+        self.vocab = SkillVocabulary(self.skills)
+        for names in self.expansions + self.soft_expansions:
+            for name in sorted(names):
+                self.vocab.add(name)
+        self.adjacency = self._adjacency(self.expansions)
+        self.soft_adjacency = self._adjacency(
+            [soft if s in self.soft else plain
+             for s, plain, soft in zip(self.skills, self.expansions, self.soft_expansions)]
+        )
+        # float32 copies for statuses_many's products, made once per profile
+        self._adjacency_f32 = self.adjacency.astype(np.float32)
+        self._soft_adjacency_f32 = self.soft_adjacency.astype(np.float32)
+
+    def _adjacency(self, expansions):
+        # adjacency[j, r]: resume skill r makes JD skill j a partial match
+        adjacency = np.zeros((len(self.skills), len(self.vocab)), dtype=bool)
+        for j, names in enumerate(expansions):
+            adjacency[j, [self.vocab.ids[n] for n in names]] = True
+        return adjacency
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __reduce__(self):
+        # Pickled (e.g. for pool workers) as its inputs only; each process
+        # compiles a given profile once and reuses it
+        return (_compiled, (self.skills, self.soft, self.jd_hash, self.skills_version))
+
+    def __repr__(self):
+        return f"JDProfile({len(self.skills)} skills, {len(self.soft)} soft, jd_hash={self.jd_hash[:12]!r})"
+
+    # ================= BUILDING =================
+
+    @classmethod
+    def from_document(cls, doc, jd_hash=""):
+        """Profile of an already-parsed JD (a ParsedDocument)"""
+        return cls(
+            [s["name"] for s in doc.skills],
+            soft=[s["name"] for s in doc.skills if s.get("type") == "Soft"],
+            jd_hash=jd_hash,
+        )
+
+    @classmethod
+    def from_bytes(cls, data, file_type=None):
+        """Parse a JD file (PDF / DOCX / TXT); raises ValueError when unreadable"""
+        doc = parse_document(data, file_type)
+        if doc.error:
+            raise ValueError(f"could not read job description: {doc.error}")
+        profile = cls.from_document(doc, content_hash(data))
+        profile.truncated = doc.truncated
+        return profile
+
+    @classmethod
+    def from_text(cls, text):
+        """Profile of already-cleaned JD text"""
+        return cls.from_document(parse_text(text), content_hash(text.encode("utf-8")))
+
+    # ================= SERIALIZATION =================
+
+    def to_dict(self):
+        return {
+            "format": PROFILE_FORMAT,
+            "skills_version": self.skills_version,
+            "jd_hash": self.jd_hash,
+            "skills": [
+                {
+                    "name": name,
+                    "type": "Soft" if name in self.soft else "Technical",
+                    "partial": sorted(plain),
+                    **({"soft_partial": sorted(soft)} if name in self.soft else {}),
+                }
+                for name, plain, soft in zip(self.skills, self.expansions, self.soft_expansions)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a saved profile; ValueError if it was made for another format or SKILLS_VERSION"""
+        if data.get("format") != PROFILE_FORMAT:
+            raise ValueError(f"unsupported JD profile format {data.get('format')!r}")
+        if data.get("skills_version") != SKILLS_VERSION:
+            raise ValueError("JD profile was built with a different skill taxonomy or extractor")
+        skills = data["skills"]
+        return cls(
+            [s["name"] for s in skills],
+            soft=[s["name"] for s in skills if s.get("type") == "Soft"],
+            jd_hash=data.get("jd_hash", ""),
+        )
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    # ================= SCORING =================
+
+    def encode(self, resume_skill_names):
+        """Boolean row over the profile's local vocabulary"""
+        ids = self.vocab.ids
+        row = np.zeros(len(self.vocab), dtype=bool)
+        row[[ids[n] for n in map(normalize_skill, resume_skill_names) if n in ids]] = True
+        return row
+
+    def statuses(self, resume_skill_names, soft_rules=False):
+        """
+        (exact, partial) boolean arrays over self.skills. soft_rules=True
+        applies get_soft_skill_status to the soft skills, as the Similarity
+        Matrix does; the default matches compute_skill_gap.
+        """
+        row = self.encode(resume_skill_names)
+        exact = row[: len(self.skills)]
+        adjacency = self.soft_adjacency if soft_rules else self.adjacency
+        partial = adjacency[:, row].any(axis=1) & ~exact
+        return exact, partial
+
+    def statuses_many(self, resume_rows, soft_rules=False):
+        """
+        Same for a (n, len(self.vocab)) matrix of encoded resumes:
+        (exact, partial) boolean arrays of shape (n, len(self)).
+        """
+        exact = resume_rows[:, : len(self.skills)]
+        adjacency = self._soft_adjacency_f32 if soft_rules else self._adjacency_f32
+        covers = (resume_rows.astype(np.float32) @ adjacency.T) > 0
+        return exact, covers & ~exact
+
+    def score(self, resume_skill_names):
+        """(matched, partial, missing) sets, exactly as compute_skill_gap"""
+        exact, partial = self.statuses(resume_skill_names)
+        matched = {self.skills[i] for i in np.flatnonzero(exact)}
+        partial = {self.skills[i] for i in np.flatnonzero(partial)}
+        return matched, partial, set(self.skills) - matched - partial
+
+    def overall_match(self, matched_count):
+        return int((matched_count / len(self.skills)) * 100) if self.skills else 0
+
+    def gap(self, resume_skill_names):
+        """Overall match % and sorted matched/partial/missing lists"""
+        matched, partial, missing = self.score(resume_skill_names)
+        return {
+            "overall_match": self.overall_match(len(matched)),
+            "matched": sorted(matched),
+            "partial": sorted(partial),
+            "missing": sorted(missing),
+        }
+
+@lru_cache(maxsize=256)
+def _compiled(skills, soft, jd_hash, skills_version):
+    return JDProfile(skills, soft, jd_hash, skills_version)
+
+# ================= ON-DISK CACHE =================
+
+def profile_path(jd_hash, directory=PROFILE_DIR):
+    return os.path.join(directory, f"{jd_hash[:32]}.json")
+
+def cached_profile(data, file_type=None, directory=PROFILE_DIR):
+    """
+    The JDProfile for these JD bytes: loaded from `directory` when a current
+    one is there, otherwise parsed and saved. directory=None (or "") never
+    touches the disk.
+    """
+    if not directory:
+        return JDProfile.from_bytes(data, file_type)
+
+    path = profile_path(content_hash(data), directory)
+    try:
+        return JDProfile.load(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing, unreadable or stale: rebuild below
+
+    profile = JDProfile.from_bytes(data, file_type)
+    if profile.truncated:
+        return profile
+    try:
+        profile.save(path)
+    except OSError:
+        pass  # read-only checkout: still usable from memory
+    return profile
@@ -0,0 +1,134 @@
+"""
+Skill Gap AI - PDF / CSV report export.
+
+Reports are built from an AnalysisResult only when a download is requested,
+and memoized on a fingerprint of the analysis so repeated downloads of the
+same result don't rebuild the FPDF document.
+"""
+
+import hashlib
+import io
+import json
+
+from instrumentation import stage
+from skill_analysis import DocumentCache
+
+REPORT_CACHE = DocumentCache(maxsize=32)
+
+def analysis_fingerprint(result):
+    """Stable hash of everything a report prints"""
+    payload = json.dumps([
+        result.candidate_name,
+        result.linkedin_url,
+        result.candidate_email,
+        result.candidate_phone,
+        result.candidate_github,
+        result.overall_match,
+        sorted(result.matched),
+        sorted(result.partial),
+        sorted(result.missing),
+        sorted(result.all_skills),
+    ])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def generate_pdf_report(result):
+    """Generate PDF report without encoding issues"""
+    from fpdf import FPDF
+
+    matched, partial, missing = result.matched, result.partial, result.missing
+
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Title
+    pdf.set_font("Arial", "B", 16)
+    pdf.cell(0, 10, "Skill Gap Analysis Report", ln=True, align="C")
+    pdf.ln(10)
+
+    # Candidate Info - extracted once per document by the analysis core
+    pdf.set_font("Arial", "", 12)
+    pdf.cell(0, 8, f"Candidate: {result.candidate_name}", ln=True)
+    if result.linkedin_url:
+        pdf.cell(0, 8, f"LinkedIn: {result.linkedin_url}", ln=True)
+    if result.candidate_email:
+        pdf.cell(0, 8, f"Email: {result.candidate_email}", ln=True)
+    if result.candidate_phone:
+        pdf.cell(0, 8, f"Phone: {result.candidate_phone}", ln=True)
+    if result.candidate_github:
+        pdf.cell(0, 8, f"GitHub: {result.candidate_github}", ln=True)
+    pdf.cell(0, 8, f"Overall Match: {result.overall_match}%", ln=True)
+    pdf.ln(5)
+
+    # Matched Skills
+    if matched:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Matched Skills:", ln=True)
+        pdf.set_font("Arial", "", 12)
+        for skill in sorted(matched):
+            pdf.cell(0, 8, f"  - {skill.title()}", ln=True)
+        pdf.ln(5)
+
+    # Missing Skills
+    if missing:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Missing Skills:", ln=True)
+        pdf.set_font("Arial", "", 12)
+        for skill in sorted(missing):
+            pdf.cell(0, 8, f"  - {skill.title()}", ln=True)
+        pdf.ln(5)
+
+    # Recommendations
+    if missing or partial:
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, "Recommendations:", ln=True)
+        pdf.set_font("Arial", "", 12)
+        for skill in sorted(missing | partial):
+            pdf.cell(0, 8, f"  - Improve {skill.title()} through courses", ln=True)
+
+    return pdf.output(dest='S').encode('latin-1')
+
+def generate_csv_report(result):
+    """Generate CSV report with skill scores instead of Yes/No"""
+    output = io.StringIO()
+
+    # CSV Header
+    output.write("Skill,Status,Resume Score (%),Job Requirement Score (%)\n")
+
+    for skill in sorted(result.all_skills):
+        if skill in result.matched:
+            status = "Matched"
+            resume_score = 85
+            jd_score = 90
+        elif skill in result.partial:
+            status = "Partial"
+            resume_score = 55
+            jd_score = 80
+        else:
+            status = "Missing"
+            resume_score = 20
+            jd_score = 90
+
+        output.write(
+            f"{skill.title()},{status},{resume_score},{jd_score}\n"
+        )
+
+    return output.getvalue().encode("utf-8")
+
+REPORT_BUILDERS = {
+    "pdf": generate_pdf_report,
+    "csv": generate_csv_report,
+}
+
+def get_report(kind, result):
+    """Report bytes for `kind` ("pdf" / "csv"), built at most once per analysis"""
+    key = (kind, analysis_fingerprint(result))
+    data = REPORT_CACHE.get(key)
+    if data is None:
+        with stage(f"export.{kind}"):
+            data = REPORT_BUILDERS[kind](result)
+        REPORT_CACHE.put(key, data)
+    return data
+
+def report_downloader(kind, result):
+    """Zero-argument callable for st.download_button: bytes are built on click"""
+    return lambda: get_report(kind, result)
@@ -0,0 +1,138 @@
+"""
+Skill Gap AI - screening many resumes against one job description.
+
+The dashboard's multi-file mode hands every uploaded resume to a process
+pool shared by all sessions in the server. Each worker runs the normal
+pipeline (parse_document, then build_result against the already-parsed JD)
+and sends back the full AnalysisResult, so opening a candidate from the
+leaderboard needs no further work.
+
+    screening = Screening(jd_doc, jd_hash, files)   # files: [(name, data, file_type)]
+    screening.start()
+    screening.poll()                                # collect whatever has finished
+    screening.rows()                                # leaderboard, best first
+
+Nothing here imports Streamlit.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import skill_analysis
+import text_extraction
+from skill_analysis import build_result, content_hash, display_skill, parse_document
+
+TOP_MISSING = 3             # missing skills listed per leaderboard row
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _init_worker():
+    # Forked from the Streamlit process, which may have the store open already
+    skill_analysis.reset_document_store()
+    text_extraction.use_single_page_worker()
+
+def get_pool(workers=None):
+    """Process pool shared by every screening in this server process"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers or min(4, os.cpu_count() or 1),
+                                        initializer=_init_worker)
+        return _pool
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+def score_resume(data, file_type, jd_doc):
+    """Worker: parse one resume and analyse it against the parsed JD"""
+    return build_result(parse_document(data, file_type), jd_doc)
+
+class Screening:
+    """One JD against a set of resumes, scored in the background"""
+
+    def __init__(self, jd_doc, jd_hash, files, previous=None):
+        self.jd_doc = jd_doc
+        self.jd_hash = jd_hash
+        # resume hash -> upload details; duplicates of one file count once
+        self.files = {}
+        for name, data, file_type in files:
+            self.files.setdefault(content_hash(data), {"name": name, "data": data, "type": file_type})
+        self.results = {}
+        self.errors = {}
+        self._futures = {}
+
+        # Results already scored against the same JD carry over
+        if previous is not None and previous.jd_hash == jd_hash:
+            for resume_hash in self.files.keys() & previous.results.keys():
+                self.results[resume_hash] = previous.results[resume_hash]
+
+    @property
+    def key(self):
+        return self.jd_hash, frozenset(self.files)
+
+    @property
+    def total(self):
+        return len(self.files)
+
+    @property
+    def finished(self):
+        return len(self.results) + len(self.errors)
+
+    @property
+    def done(self):
+        return self.finished == self.total
+
+    def start(self, pool=None):
+        pool = pool or get_pool()
+        for resume_hash, upload in self.files.items():
+            if resume_hash not in self.results and resume_hash not in self._futures:
+                self._futures[resume_hash] = pool.submit(score_resume, upload["data"], upload["type"], self.jd_doc)
+
+    def poll(self):
+        """Move finished work into results / errors; returns how many finished since the last poll"""
+        finished = [h for h, future in self._futures.items() if future.done()]
+        for resume_hash in finished:
+            future = self._futures.pop(resume_hash)
+            try:
+                result = future.result()
+            except Exception as e:
+                self.errors[resume_hash] = f"{type(e).__name__}: {e}"
+                continue
+            if result.resume_error:
+                self.errors[resume_hash] = result.resume_error
+            else:
+                self.results[resume_hash] = result
+        return len(finished)
+
+    def cancel(self):
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+
+    def rows(self, top_missing=TOP_MISSING):
+        """
+        One leaderboard row per scored resume: best overall match first,
+        then most partial matches, then fewest missing. Each row carries
+        its resume hash so a selection can be mapped back to its result.
+        """
+        rows = []
+        for resume_hash, result in self.results.items():
+            missing = [s["name"] for s in result.jd_skills if s["name"].lower() in result.missing]
+            rows.append({
+                "resume_hash": resume_hash,
+                "Candidate": result.candidate_name,
+                "File": self.files[resume_hash]["name"],
+                "Overall Match %": result.overall_match,
+                "Matched": len(result.matched),
+                "Partial": len(result.partial),
+                "Missing": len(result.missing),
+                "Top Missing Skills": ", ".join(display_skill(s) for s in missing[:top_missing]),
+            })
+        rows.sort(key=lambda r: (-r["Overall Match %"], -r["Partial"], r["Missing"], r["File"]))
+        return rows
@@ -0,0 +1,1083 @@
+"""
+Skill Gap AI - headless analysis core.
+
+Everything needed to turn a resume and a job description into a skill gap
+analysis, with no Streamlit import. app_final.py renders on top of this.
+"""
+
+import hashlib
+import io
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict, deque, namedtuple
+from dataclasses import dataclass, replace
+from itertools import takewhile
+from functools import lru_cache
+
+from document_store import DocumentStore
+from instrumentation import stage
+from skill_taxonomy import SkillTaxonomy, normalize_skill
+from text_extraction import (
+    DEFAULT_POLICY,
+    EXTRACTION_POLICIES,
+    Deadline,
+    EXTRACTOR_VERSION,
+    extract_with_policy,
+    iter_pdf_page_texts,
+    looks_degenerate,
+    pdf_page_fingerprints,
+)
+
+# ================= TAXONOMY =================
+
+# Skills, merge rules, synonym groups and display names all come from one
+# file, compiled into hash lookups at import. Override with SKILL_GAP_TAXONOMY.
+TAXONOMY_PATH = os.environ.get(
+    "SKILL_GAP_TAXONOMY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+)
+TAXONOMY = SkillTaxonomy.load(TAXONOMY_PATH)
+TAXONOMY_VERSION = TAXONOMY.version
+
+# Bump when extraction rules change in a way that changes skill lists
+SKILL_EXTRACTION_VERSION = "3"
+# What a parsed document's skills depend on: caches of extracted skills
+# (document store, JD profiles, JD libraries, batch runs) key on this
+SKILLS_VERSION = f"{TAXONOMY_VERSION}-{SKILL_EXTRACTION_VERSION}"
+
+SOFT_SKILL_SYNONYMS = TAXONOMY.synonym_groups["Soft"]
+SYNONYM_MAP = TAXONOMY.synonym_groups["Technical"]
+SYNONYM_LOOKUP = TAXONOMY.synonym_lookup
+PARTIAL_MATCHES = TAXONOMY.partial_matches
+
+def get_soft_skill_status(jd_skill, resume_skills):
+    # Exact match, else synonym-based partial match ONLY, else missing
+    return TAXONOMY.soft_match_status(jd_skill, {normalize_skill(r) for r in resume_skills})
+
+def get_match_status(jd_skill, resume_skills):
+    # Exact match (STRICT), else controlled partial match via synonyms ONLY, else missing
+    return TAXONOMY.match_status(jd_skill, {normalize_skill(r) for r in resume_skills})
+
+# ================= UTILS =================
+
+def clean_text(text):
+    """Clean extracted text from PDF/DOCX files - PRESERVE URLs"""
+    # Remove cid patterns
+    text = re.sub(r'\$cid[:]*\d+\$', '', text, flags=re.IGNORECASE)
+    
+    # Fix camelCase spacing
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+    
+    # Normalize whitespace
+    text = re.sub(r'[ \t]+', ' ', text)
+    
+    # Remove excessive newlines
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    
+    return text.strip()
+# ================= SECTIONS =================
+
+# Headings the segmenter knows, matched at the start of a line. Summary
+# headings open the professional summary; the rest are the sections it and
+# the soft-skills window stop at.
+SUMMARY_HEADERS = ("PROFESSIONAL SUMMARY", "SUMMARY", "CAREER OBJECTIVE", "OBJECTIVE", "PROFILE", "ABOUT ME")
+SECTION_HEADERS = (
+    "TECHNICAL SKILLS", "SOFT SKILLS", "SKILLS", "TOOLS", "TECHNOLOGIES",
+    "PROJECTS", "PROJECT", "EDUCATIONAL QUALIFICATION", "EDUCATION",
+    "WORK EXPERIENCE", "PROFESSIONAL EXPERIENCE", "EXPERIENCE",
+    "CERTIFICATIONS", "CERTIFICATION", "ACHIEVEMENTS", "HOBBIES", "DECLARATION",
+)
+# Lines mentioning one of these are scanned for unknown technical terms
+TECHNICAL_LINE_KEYWORDS = ("technical", "skills", "tools", "technologies", "hardware")
+# A "soft skills" mention outside a heading ends at the first of these
+SOFT_CUTOFF_PHRASES = ("education", "projects", "experience", "certification", "hobbies", "declaration")
+
+# Longest first so "TECHNICAL SKILLS" wins over "SKILLS" inside it
+_HEADING_RE = re.compile(
+    r"^[ \t#*]*(?P<head>"
+    + "|".join(re.escape(h) for h in sorted(SUMMARY_HEADERS + SECTION_HEADERS, key=len, reverse=True))
+    + r")(?![A-Za-z0-9])[ \t*]*(?P<sep>[:\-–|])?[ \t]*(?P<rest>[^\n]*)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+Section = namedtuple("Section", ["name", "start", "end"])
+
+class Sections:
+    """
+    One document split into (name, start, end) spans in a single regex pass.
+    Text before the first heading is the "GENERAL" span; a heading's span
+    starts right after the heading (so inline content like "Skills: Python"
+    belongs to it) and ends where the next heading line starts. Also holds
+    the lowercased text, so extractors never lowercase the document again.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+
+        spans = []
+        name, start = "GENERAL", 0
+        for m in _HEADING_RE.finditer(text):
+            head = m.group("head")
+            # "Experience with Python" is prose; "EXPERIENCE", "Experience:"
+            # and "EXPERIENCE Python, SQL" are headings (summary headings
+            # take inline text either way: "Summary Motivated engineer...")
+            name_upper = head.upper()
+            if not (m.group("sep") or not m.group("rest").strip() or head.isupper()
+                    or name_upper in SUMMARY_HEADERS):
+                continue
+            spans.append(Section(name, start, m.start()))
+            name, start = name_upper, m.start("rest")
+        spans.append(Section(name, start, len(text)))
+        self.spans = tuple(spans)
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def named(self, *names):
+        return [s for s in self.spans if s.name in names]
+
+    def first(self, *names):
+        return next((s for s in self.spans if s.name in names), None)
+
+    def slice(self, section, lower=False):
+        return (self.lower if lower else self.text)[section.start:section.end]
+
+    def lines(self, section):
+        return self.slice(section).split("\n")
+
+@lru_cache(maxsize=64)
+def segment(text):
+    """Sections of `text`, computed once and shared by every extractor"""
+    return Sections(text)
+
+def detect_sections(text):
+    """{section name: [lines]}, "GENERAL" for anything before the first heading"""
+    return {section.name: segment(text).lines(section) for section in segment(text)}
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_TYPE = "text/plain"
+
+def detect_file_type(data):
+    """Guess the MIME type of raw file bytes from their magic number"""
+    if data[:5] == b"%PDF-":
+        return PDF_TYPE
+    if data[:4] == b"PK\x03\x04":
+        return DOCX_TYPE
+    return TXT_TYPE
+
+def extract_text(file, file_type=None):
+    """Extract text from uploaded file"""
+    file_type = file_type or file.type
+    if file_type == PDF_TYPE:
+        # Fast backend first, layout-preserving pdfplumber only as a fallback
+        text, _ = extract_with_policy(file.read(), "pdf")
+        return text
+    elif file_type == DOCX_TYPE:
+        # Bullets & symbols are normalized by the DOCX backends as they read
+        text, _ = extract_with_policy(file.read(), "docx")
+        return text
+    elif file_type == TXT_TYPE:
+        return file.read().decode("utf-8")
+    return ""
+
+def extract_text_from_bytes(data, file_type=None):
+    """Extract text from raw file bytes, sniffing the type when not given"""
+    return extract_text(io.BytesIO(data), file_type or detect_file_type(data))
+
+# ================= CONTACT DETAILS =================
+
+# Contact details live at the top of a resume: everything is looked for in
+# the header region (text before the first section heading, at most
+# HEADER_CHARS) first. Only fields still missing fall back to the rest of
+# the document, and that fallback jumps straight to the lines holding an
+# anchor ("linkedin", "@", "github", "phone", "name") with str.find on the
+# shared lowercased text. It covers the first FALLBACK_CHARS and the last
+# FOOTER_CHARS (contact footers), so cost stays flat however long the
+# document gets.
+HEADER_CHARS = 2000
+FALLBACK_CHARS = 20000
+FOOTER_CHARS = 2000
+NAME_LINES = 10
+
+_MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_LINKEDIN_LABEL_RE = re.compile(r'LinkedIn[:]?\s*([^\s]+)', re.IGNORECASE)
+_LINKEDIN_URL_RES = [
+    re.compile(r'(https?://(?:www\.)?linkedin\.com/[^\s]+)', re.IGNORECASE),
+    re.compile(r'(www\.linkedin\.com/[^\s]+)', re.IGNORECASE),
+    re.compile(r'(linkedin\.com/[^\s]+)', re.IGNORECASE),
+]
+_GITHUB_RE = re.compile(r'((?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9_.-]+(?:/[A-Za-z0-9_.-]+)?)', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'([a-zA-Z0-9._%+-]+)@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_PHONE_RE = re.compile(r'(?<![\w+])(\+?\d[\d \t().-]{7,}\d)(?!\w)')
+# "Name: Jane Doe" - a labelled, capitalized name, not "Company Name Inc"
+_NAME_LABEL_RE = re.compile(r'\b(?i:name)[ \t]*[:\-][ \t]*([A-Z][a-zA-Z]*(?:[ \t]+[A-Z][a-zA-Z]*)+)')
+_NAME_STRIP_RE = re.compile(r'^[#\*\s]+|[#\*\s]+$')
+_URL_TRAILING_RE = re.compile(r'[.,;:)\]]+$')
+_NOT_A_NAME = ('@', 'http', '://', 'www.', 'linkedin', 'phone', 'mobile')
+
+def _anchored_lines(text, lower, anchor, start=0):
+    """
+    Lines of `text` containing `anchor` from `start` on, found with
+    str.find within the first FALLBACK_CHARS and the last FOOTER_CHARS
+    """
+    footer = max(FALLBACK_CHARS, len(text) - FOOTER_CHARS)
+    for lo, hi in ((start, FALLBACK_CHARS), (max(start, footer), len(text))):
+        pos = lower.find(anchor, lo, hi)
+        while pos != -1:
+            line_start = lower.rfind("\n", 0, pos) + 1
+            line_end = lower.find("\n", pos)
+            if line_end == -1:
+                line_end = len(text)
+            yield text[line_start:line_end]
+            pos = lower.find(anchor, line_end, hi)
+
+def _find_linkedin(text):
+    # Markdown link, then "LinkedIn:" label, then a bare URL
+    for link_text, url in _MARKDOWN_LINK_RE.findall(text):
+        if 'linkedin.com' in url.lower():
+            return url
+        if 'linkedin.com' in link_text.lower():
+            return link_text
+    match = _LINKEDIN_LABEL_RE.search(text)
+    if match and 'linkedin.com' in match.group(1).lower():
+        return match.group(1)
+    for pattern in _LINKEDIN_URL_RES:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return ""
+
+def _clean_url(url, domain, bare_prefix):
+    url = _URL_TRAILING_RE.sub('', url.strip())
+    # Ensure proper protocol
+    if url and not url.startswith('http'):
+        if url.startswith('www.'):
+            url = 'https://' + url
+        elif url.lower().startswith(domain):
+            url = bare_prefix + url
+    return url
+
+def _find_phone(text):
+    for match in _PHONE_RE.finditer(text):
+        digits = sum(ch.isdigit() for ch in match.group(1))
+        if 10 <= digits <= 15:
+            return match.group(1).strip()
+    return ""
+
+def _name_from_lines(lines):
+    # Name in the first few lines: 2-4 mostly capitalized words, no contact details
+    for line in lines[:NAME_LINES]:
+        line = line.strip()
+        if not line:
+            continue
+        clean_line = _NAME_STRIP_RE.sub('', line)
+        words = clean_line.split()
+        if 2 <= len(words) <= 4:
+            capitalized_words = sum(1 for w in words if w and w[0].isupper())
+            if capitalized_words >= len(words) - 1:
+                if not any(x in line.lower() for x in _NOT_A_NAME):
+                    return clean_line
+    return ""
+
+def _name_from_email(email_local):
+    name_parts = [p for p in email_local.split('.') if p and not p.isdigit()]
+    if len(name_parts) >= 2:
+        return ' '.join(p.title() for p in name_parts[:2])
+    return ""
+
+def _search_lines(lines, find):
+    for line in lines:
+        found = find(line)
+        if found:
+            return found
+    return ""
+
+def _github(text):
+    match = _GITHUB_RE.search(text)
+    return match.group(1) if match else ""
+
+def _name_label(line):
+    match = _NAME_LABEL_RE.search(line)
+    return match.group(1).strip() if match else ""
+
+def extract_contact(text):
+    """
+    Name, LinkedIn, email, phone and GitHub from resume text as a dict
+    (empty strings when not found; name defaults to "Candidate").
+    parse_document keeps the result per document hash, in memory and in
+    the document store.
+    """
+    sections = segment(text)
+    lower = sections.lower
+    header_end = min(sections.spans[0].end, HEADER_CHARS)
+    header = text[:header_end]
+
+    linkedin = _find_linkedin(header) or _search_lines(
+        _anchored_lines(text, lower, "linkedin", header_end), _find_linkedin)
+    github = _github(header) or _search_lines(
+        _anchored_lines(text, lower, "github.com", header_end), _github)
+    email_match = _EMAIL_RE.search(header) or next(
+        filter(None, map(_EMAIL_RE.search, _anchored_lines(text, lower, "@", header_end))), None)
+    phone = _find_phone(header) or _search_lines(
+        (line for label in ("phone", "mobile") for line in _anchored_lines(text, lower, label, header_end)),
+        _find_phone)
+
+    # Name: top lines of the header, else a "Name:" label, else the email address
+    name = _name_from_lines(header.split('\n')) or _search_lines(
+        _anchored_lines(text, lower, "name"), _name_label)
+    if not name and email_match:
+        name = _name_from_email(email_match.group(1))
+
+    return {
+        "name": name or "Candidate",
+        "linkedin": _clean_url(linkedin, "linkedin.com", "https://www.") if linkedin else "",
+        "email": email_match.group(0) if email_match else "",
+        "phone": phone,
+        "github": _clean_url(github, "github.com", "https://") if github else "",
+    }
+
+def extract_name_and_linkedin(text):
+    """Extract candidate name and LinkedIn URL from resume text - returns tuple (name, linkedin_url)"""
+    contact = extract_contact(text)
+    return contact["name"], contact["linkedin"]
+
+def extract_professional_summary(text):
+    """
+    Extract the FULL professional summary exactly as written in the resume.
+    Handles inline + multi-line summaries.
+    """
+    sections = segment(text)
+    collected = []
+    capturing = False
+
+    # From the first summary heading until the next non-summary section
+    for section in sections:
+        if section.name in SUMMARY_HEADERS:
+            capturing = True
+        elif capturing:
+            break
+        else:
+            continue
+        collected += [line.strip() for line in sections.lines(section) if line.strip()]
+
+    summary = " ".join(collected).strip()
+
+    if len(summary) >= 30:
+        return summary
+
+    return "Professional summary not clearly specified in the resume."
+
+# ================= COMPREHENSIVE SKILL LISTS =================
+
+TECHNICAL_SKILLS = TAXONOMY.technical_skills
+SOFT_SKILLS = TAXONOMY.soft_skills
+
+# ================= SKILL SCANNER =================
+
+SkillMatch = namedtuple("SkillMatch", ["name", "type", "start", "end"])
+
+def _is_word_char(ch):
+    # Same definition of a word character as regex \w
+    return ch.isalnum() or ch == "_"
+
+def _is_word_boundary(text, pos, lo, hi):
+    """Regex \b semantics at `pos`, treating text[lo:hi] as the whole string"""
+    before = pos > lo and _is_word_char(text[pos - 1])
+    after = pos < hi and _is_word_char(text[pos])
+    return before != after
+
+class AhoCorasick:
+    """
+    Multi-pattern substring automaton. Reports every occurrence of every
+    pattern in one pass over the text, overlapping ones included.
+    """
+
+    def __init__(self, patterns):
+        self.lengths = [len(p) for p in patterns]
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for idx, pattern in enumerate(patterns):
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = nxt
+            self.output[node].append(idx)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def iter_matches(self, text):
+        """Yield (pattern index, end offset) for every occurrence in `text`"""
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx in output[node]:
+                yield idx, i + 1
+
+class SkillScanner(AhoCorasick):
+    """
+    Aho-Corasick automaton over every known skill name.
+    Finds all skills in a single pass over the text with the same
+    word-boundary rules as re.search(r'\b' + skill + r'\b', text).
+    """
+
+    def __init__(self, skills):
+        # skills: list of (name, type) pairs, in priority order
+        self.skills = list(skills)
+        super().__init__([name.lower() for name, _ in self.skills])
+
+    def scan(self, text, windows=None):
+        """
+        Return every word-bounded skill occurrence in `text` as SkillMatch
+        tuples with (start, end) offsets. `text` must already be lowercased.
+
+        `windows` optionally maps a skill type to a (lo, hi) slice of `text`:
+        matches of that type must lie inside the slice, and word boundaries
+        are judged as if the slice were the whole string.
+        """
+        windows = windows or {}
+        full = (0, len(text))
+        matches = []
+
+        for idx, end in self.iter_matches(text):
+            name, skill_type = self.skills[idx]
+            start = end - self.lengths[idx]
+            lo, hi = windows.get(skill_type, full)
+            if start < lo or end > hi:
+                continue
+            if _is_word_boundary(text, start, lo, hi) and _is_word_boundary(text, end, lo, hi):
+                matches.append(SkillMatch(name, skill_type, start, end))
+
+        return matches
+
+def build_skill_scanner():
+    return SkillScanner(TAXONOMY.skills)
+
+SKILL_SCANNER = build_skill_scanner()
+
+def extract_additional_technical_terms(text):
+    """
+    Extract unknown technical terms (order preserved)
+    Example: Arduino Nano, 8051, LM35, IR Sensor
+    """
+    results = []
+    seen = set()
+
+    # Only scan lines that mention a technical keyword; the keyword test
+    # reads the shared lowercased text instead of lowering every line
+    lines = text.split("\n")
+    for line, line_lower in zip(lines, segment(text).lower.split("\n")):
+        if any(k in line_lower for k in TECHNICAL_LINE_KEYWORDS):
+            for t in re.findall(r'\b[A-Z][A-Za-z0-9\-]{2,}\b', line):
+                key = t.lower()
+                if key not in seen:
+                    seen.add(key)
+                    results.append(t)
+
+    return results
+
+def extract_skills(text):
+    """
+    Improved skill extraction:
+    - Technical skills: searched in whole resume
+    - Soft skills: searched ONLY after 'Soft Skills' heading (prevents leakage from degree names)
+    - Basic false-positive filtering
+    """
+    sections = segment(text)
+    full_text_lower = sections.lower
+    soft_window = soft_skills_window(sections) or (0, len(full_text_lower))
+
+    # Single pass over the document for every known skill
+    found = {
+        (m.name, m.type)
+        for m in SKILL_SCANNER.scan(full_text_lower, windows={"Soft": soft_window})
+    }
+    return skills_from_found(found)
+
+def soft_skills_window(sections):
+    """
+    (start, end) of the Soft Skills section, capped at ~2000 chars. Without
+    a Soft Skills heading, a "soft skills" mention in prose ("strong soft
+    skills such as...") opens the window instead, up to the first cutoff
+    phrase. None when the text never says "soft skills" (soft skills then
+    count in the whole text).
+    """
+    soft = sections.first("SOFT SKILLS")
+    if soft is not None:
+        return soft.start, min(soft.end, soft.start + 2000)  # safety limit
+
+    lower = sections.lower
+    at = lower.find("soft skills")
+    if at < 0:
+        return None
+    start = at + len("soft skills")
+    cutoffs = (lower.find(phrase, start) for phrase in SOFT_CUTOFF_PHRASES)
+    return start, min([start + 2000, len(lower)] + [i for i in cutoffs if i >= 0])
+
+def skills_from_found(found):
+    """Skill dicts, in taxonomy order and post-filtered, from a set of (name, type) scan hits"""
+    skills = []
+    seen = set()
+
+    # 1. Technical skills – whole document
+    for skill in TECHNICAL_SKILLS:
+        if (skill, "Technical") in found:
+            key = skill.lower()
+            if key not in seen:
+                skills.append({"name": skill, "type": "Technical", "confidence": 92})
+                seen.add(key)
+
+    # 2. Soft skills – only in soft section (or fallback to whole text if no section found)
+    for skill in SOFT_SKILLS:
+        if (skill, "Soft") in found:
+            key = skill.lower()
+            if key not in seen:
+                skills.append({"name": skill, "type": "Soft", "confidence": 88})
+                seen.add(key)
+
+    # ─── Simple post-filters to remove common false positives ───
+    # Post-filters - remove obvious false positives
+    filtered_skills = []
+    has_embedded_c = any("embedded c" in s["name"].lower() for s in skills)
+
+    for s in skills:
+        name_lower = s["name"].lower().strip()
+
+        # Skip plain "C" when Embedded C exists
+        if name_lower in ["c", "c programming", "c language"] and has_embedded_c:
+            continue
+
+        # Optional: skip very generic terms if you want
+        if name_lower in ["sensor", "sensors"]:
+            continue  # if you don't want generic "Sensor"
+
+        filtered_skills.append(s)
+
+    return filtered_skills
+
+# "canonical_key": [possible variant substrings or exact names], first match wins
+MERGE_RULES = TAXONOMY.merge_rules
+
+class MergeEngine:
+    """
+    Precompiled merge rules. One Aho-Corasick pass over a skill name finds
+    every variant it contains; the lowest-numbered rule among the hits (or
+    an exact canonical-name hit) wins, same as checking the rules in order.
+    """
+
+    def __init__(self, merge_rules):
+        self.canonicals = list(merge_rules)
+        self.exact = {canon: i for i, canon in enumerate(self.canonicals)}
+
+        patterns = []
+        self.pattern_rule = []
+        self.always = None  # first rule with an empty variant matches everything
+        for i, variants in enumerate(merge_rules.values()):
+            for v in variants:
+                if not v:
+                    self.always = i if self.always is None else self.always
+                    continue
+                patterns.append(v)
+                self.pattern_rule.append(i)
+        self.automaton = AhoCorasick(patterns)
+
+    def canonical(self, name_lower):
+        """Canonical key of the first rule matching `name_lower`, or None"""
+        best = self.exact.get(name_lower, len(self.canonicals))
+        if self.always is not None:
+            best = min(best, self.always)
+        pattern_rule = self.pattern_rule
+        for idx, _ in self.automaton.iter_matches(name_lower):
+            if pattern_rule[idx] < best:
+                best = pattern_rule[idx]
+        return self.canonicals[best] if best < len(self.canonicals) else None
+
+MERGE_ENGINE = MergeEngine(MERGE_RULES)
+
+def normalize_and_merge_skills(skills_list):
+    """
+    Merge very similar / variant skill names into one canonical name.
+    This prevents duplicates like 'Arduino' + 'Arduino Nano'.
+    Expand merge_rules in skill_taxonomy.json as you see more real resumes.
+    """
+    canonical_map = {}
+
+    for skill in skills_list:
+        name_lower = skill["name"].lower().strip().replace("-", " ")
+
+        # One automaton pass per name instead of every variant of every rule
+        canon_key = MERGE_ENGINE.canonical(name_lower)
+        if canon_key is not None:
+            display_name = canon_key.title()  # Use clean canonical name
+            if canon_key not in canonical_map or skill["confidence"] > canonical_map[canon_key]["confidence"]:
+                canonical_map[canon_key] = {
+                    "name": display_name,
+                    "type": skill["type"],
+                    "confidence": max(skill["confidence"], canonical_map.get(canon_key, {}).get("confidence", 0))
+                }
+        else:
+            key = name_lower
+            if key not in canonical_map or skill["confidence"] > canonical_map[key]["confidence"]:
+                canonical_map[key] = skill
+
+    # Return sorted list: Technical first, then Soft
+    merged = list(canonical_map.values())
+    tech = sorted([s for s in merged if s["type"] == "Technical"], key=lambda x: x["name"].lower())
+    soft = sorted([s for s in merged if s["type"] == "Soft"], key=lambda x: x["name"].lower())
+    
+    return tech + soft  # ← This is the final return — nothing after this!
+
+def display_skill(skill):
+    return TAXONOMY.display(skill)
+
+# ================= ANALYSIS =================
+
+@dataclass(frozen=True)
+class ParsedDocument:
+    """What the pipeline produces for one uploaded document"""
+    text: str
+    skills: list
+    name: str = "Candidate"
+    linkedin: str = ""
+    error: str = ""
+    email: str = ""
+    phone: str = ""
+    github: str = ""
+    pages: tuple = ()       # PDF page fingerprints, in page order
+    truncated: bool = False  # reading stopped at the time budget (never cached)
+
+    def contact(self):
+        return {"name": self.name, "linkedin": self.linkedin, "email": self.email,
+                "phone": self.phone, "github": self.github}
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    """
+    Everything the dashboard needs for one resume/JD pair, kept in session
+    state and shared across reruns. Frozen, with tuples and frozensets; the
+    skill dicts are the result's own copies, so they are not shared with the
+    document cache, but they are plain dicts and must be treated as
+    read-only.
+    """
+    resume_text: str
+    jd_text: str
+    resume_skills: tuple
+    jd_skills: tuple
+    resume_skill_names: frozenset
+    jd_skill_names: frozenset
+    matched: frozenset
+    partial: frozenset
+    missing: frozenset
+    overall_match: int
+    all_skills: tuple = ()
+    resume_scores: tuple = ()
+    jd_scores: tuple = ()
+    candidate_name: str = "Candidate"
+    linkedin_url: str = ""
+    resume_error: str = ""
+    jd_error: str = ""
+    candidate_email: str = ""
+    candidate_phone: str = ""
+    candidate_github: str = ""
+    resume_pages: tuple = ()
+    resume_truncated: bool = False
+    jd_truncated: bool = False
+
+def compute_skill_gap(resume_skill_names, jd_skill_names):
+    """Split JD skills into (matched, partial, missing) against the resume"""
+    matched = set()
+    partial = set()
+    resume_norms = {normalize_skill(r) for r in resume_skill_names}
+
+    for jd_skill in jd_skill_names:
+        status = TAXONOMY.match_status(jd_skill, resume_norms)
+
+        if status == "exact":
+            matched.add(jd_skill)
+        elif status == "partial":
+            partial.add(jd_skill)
+
+    missing = set(jd_skill_names) - matched - partial
+    return matched, partial, missing
+
+def compute_score_vectors(resume_skill_names, jd_skill_names):
+    """Presence scores (95 / 10) per skill in the union, for the dashboard charts"""
+    all_skills = sorted(set(jd_skill_names) | set(resume_skill_names))
+    resume_set = {normalize_skill(s) for s in resume_skill_names}
+    jd_set = {normalize_skill(s) for s in jd_skill_names}
+
+    resume_scores = [95 if normalize_skill(s) in resume_set else 10 for s in all_skills]
+    jd_scores = [95 if normalize_skill(s) in jd_set else 10 for s in all_skills]
+    return all_skills, resume_scores, jd_scores
+
+def parse_text(text, error=""):
+    """Skill extraction + merge and contact details for already-cleaned text"""
+    with stage("sections", chars=len(text)):
+        sections = segment(text)
+    with stage("extract_skills", sections=len(sections.spans)):
+        found = extract_skills(text)
+    return _finish_parse(text, found, error)
+
+def _finish_parse(text, found, error="", pages=()):
+    with stage("merge", skills=len(found)):
+        skills = normalize_and_merge_skills(found)
+    with stage("contact"):
+        contact = extract_contact(text)
+    return ParsedDocument(text, skills, error=error, pages=tuple(pages), **contact)
+
+def build_result(resume_doc, jd_doc):
+    """Gap analysis between two parsed documents"""
+    resume_skills = resume_doc.skills
+    jd_skills = jd_doc.skills
+
+    resume_skill_names = frozenset(s["name"].lower() for s in resume_skills)
+    jd_skill_names = frozenset(s["name"].lower() for s in jd_skills)
+
+    with stage("match", resume_skills=len(resume_skill_names), jd_skills=len(jd_skill_names)):
+        matched, partial, missing = compute_skill_gap(resume_skill_names, jd_skill_names)
+        overall_match = int((len(matched) / len(jd_skill_names)) * 100) if jd_skill_names else 0
+        all_skills, resume_scores, jd_scores = compute_score_vectors(resume_skill_names, jd_skill_names)
+
+    return AnalysisResult(
+        resume_text=resume_doc.text,
+        jd_text=jd_doc.text,
+        # Copies: the parsed documents' dicts also live in DOCUMENT_CACHE
+        resume_skills=tuple(dict(s) for s in resume_skills),
+        jd_skills=tuple(dict(s) for s in jd_skills),
+        resume_skill_names=resume_skill_names,
+        jd_skill_names=jd_skill_names,
+        matched=frozenset(matched),
+        partial=frozenset(partial),
+        missing=frozenset(missing),
+        overall_match=overall_match,
+        all_skills=tuple(all_skills),
+        resume_scores=tuple(resume_scores),
+        jd_scores=tuple(jd_scores),
+        candidate_name=resume_doc.name,
+        linkedin_url=resume_doc.linkedin,
+        resume_error=resume_doc.error,
+        jd_error=jd_doc.error,
+        candidate_email=resume_doc.email,
+        candidate_phone=resume_doc.phone,
+        candidate_github=resume_doc.github,
+        resume_pages=resume_doc.pages,
+        resume_truncated=resume_doc.truncated,
+        jd_truncated=jd_doc.truncated,
+    )
+
+def analyze_texts(resume_text, jd_text):
+    """Run skill extraction and gap analysis on already-cleaned text"""
+    return build_result(parse_text(resume_text), parse_text(jd_text))
+
+# ================= PARSE CACHE =================
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+class DocumentCache:
+    """
+    Thread-safe LRU cache of parsed documents, keyed by the SHA-256
+    of the file bytes. One instance is shared by every Streamlit session
+    in the server process, so reruns and re-uploads skip parsing.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+DOCUMENT_CACHE = DocumentCache()
+
+# ================= PERSISTENT STORE =================
+
+# SQLite file shared by every server process; set SKILL_GAP_STORE="" to disable
+STORE_PATH = os.environ.get("SKILL_GAP_STORE", os.path.join(".skill_gap_cache", "documents.sqlite3"))
+STORE_EXTRACTOR_VERSION = f"{EXTRACTOR_VERSION}-{DEFAULT_POLICY}"
+
+_document_store = None
+_document_store_lock = threading.Lock()
+
+def get_document_store():
+    """Open the on-disk store on first use. None when disabled or unavailable."""
+    global _document_store, STORE_PATH
+    with _document_store_lock:
+        if _document_store is None and STORE_PATH:
+            try:
+                _document_store = DocumentStore(STORE_PATH, STORE_EXTRACTOR_VERSION, SKILLS_VERSION)
+            except (OSError, sqlite3.Error):
+                STORE_PATH = ""  # read-only disk etc. – keep working without it
+        return _document_store
+
+def reset_document_store():
+    """
+    For pool workers, first thing: forget the store (and its lock) inherited
+    from the parent over fork, so the worker opens its own on first use.
+    """
+    global _document_store, _document_store_lock
+    _document_store = None
+    _document_store_lock = threading.Lock()
+
+def _load_stored(doc_hash, file_type):
+    store = get_document_store()
+    if store is None:
+        return None
+    try:
+        return store.get(doc_hash, file_type)
+    except sqlite3.Error:
+        return None
+
+def _save_stored(doc_hash, file_type, doc):
+    store = get_document_store()
+    if store is None:
+        return
+    try:
+        store.put(doc_hash, file_type, doc.text, doc.skills, doc.contact(), doc.pages)
+    except sqlite3.Error:
+        pass
+
+# ================= PAGE CACHE =================
+
+# Revised resumes usually change one page. For PDFs, each page's raw text
+# and the skills found on it are cached by (page fingerprint, backend), in
+# memory and in the store, and a new upload only reads and scans the pages
+# whose fingerprint is new. Everything document-wide (cleaning, sections,
+# the Soft Skills window, merging, contact details) still runs on the
+# merged text, so the result is the same as parsing the whole file.
+PAGE_CACHE = DocumentCache(maxsize=1024)
+
+def _page_found(raw):
+    """(name, type) skill hits on one page, Soft Skills window not applied"""
+    return frozenset((m.name, m.type) for m in SKILL_SCANNER.scan(clean_text(raw).lower()))
+
+def _load_pages(page_hashes, backend):
+    """{page_hash: (raw text, hits)} for the cached pages, memory first, then the store"""
+    pages = {}
+    for page_hash in page_hashes:
+        hit = PAGE_CACHE.get((page_hash, backend))
+        if hit is not None:
+            pages[page_hash] = hit
+
+    missing = [h for h in page_hashes if h not in pages]
+    store = get_document_store()
+    if not missing or store is None:
+        return pages
+    try:
+        stored = store.get_pages(missing, backend)
+    except sqlite3.Error:
+        return pages
+
+    rescanned = {}
+    for page_hash, record in stored.items():
+        if record["skills"] is None:
+            # Taxonomy changed since this page was stored: text is still good
+            page = rescanned[page_hash] = (record["text"], _page_found(record["text"]))
+        else:
+            page = (record["text"], frozenset(map(tuple, record["skills"])))
+        pages[page_hash] = page
+        PAGE_CACHE.put((page_hash, backend), page)
+    _save_pages(backend, rescanned)
+    return pages
+
+def _save_pages(backend, pages):
+    store = get_document_store()
+    if store is None or not pages:
+        return
+    try:
+        store.put_pages(backend, [(h, text, sorted(hits)) for h, (text, hits) in pages.items()])
+    except sqlite3.Error:
+        pass
+
+def _read_pdf_pages(data):
+    """
+    Raw text of a PDF, reading only the pages not in the page cache.
+    Backends are tried in the order of the extraction policy, with the same
+    degenerate-output fallback as extract_with_policy, all under one time
+    budget. Returns (raw text, per-page skill hits, fingerprints of the
+    pages read, whether the budget cut the document short).
+    """
+    deadline = Deadline()
+    with stage("page_hashes", bytes=len(data)):
+        page_hashes = pdf_page_fingerprints(data, deadline=deadline)
+    hashed_all = not deadline.cut_short
+
+    result, error = None, None
+    for backend in EXTRACTION_POLICIES[DEFAULT_POLICY]["pdf"]:
+        pages = _load_pages(page_hashes, backend)
+        todo = [i for i, h in enumerate(page_hashes) if h not in pages]
+        fresh = {}
+        try:
+            with stage("ingest", file_type=PDF_TYPE, backend=backend, pages=len(page_hashes), parsed=len(todo)):
+                for i, raw in iter_pdf_page_texts(data, todo, backend, deadline):
+                    fresh[page_hashes[i]] = (raw, _page_found(raw))
+        except Exception as e:
+            error = e
+            continue
+        # Pages read in full are cached even when the document was cut
+        # short, so a retry only has the rest left to read
+        for page_hash, page in fresh.items():
+            PAGE_CACHE.put((page_hash, backend), page)
+        _save_pages(backend, fresh)
+        pages.update(fresh)
+
+        # Pages left unread by the time budget end the document
+        read = list(takewhile(pages.__contains__, page_hashes))
+        raw_text = "".join(pages[h][0] + "\n" for h in read if pages[h][0])
+        result = (raw_text, [pages[h][1] for h in read], read, not hashed_all or len(read) < len(page_hashes))
+        if not looks_degenerate(raw_text):
+            break
+
+    if result is None:
+        raise error
+    return result
+
+def _parse_pdf_text(text, page_hits, page_hashes):
+    """parse_text for a PDF read page by page: page hits stand in for the full scan"""
+    with stage("sections", chars=len(text)):
+        sections = segment(text)
+    with stage("extract_skills", sections=len(sections.spans), pages=len(page_hashes)):
+        hits = set().union(*page_hits)
+        window = soft_skills_window(sections)
+        if window is not None:
+            # Soft skills only count inside the section: rescan just that
+            lo, hi = window
+            hits = {h for h in hits if h[1] != "Soft"}
+            hits.update((m.name, m.type) for m in SKILL_SCANNER.scan(sections.lower[lo:hi]) if m.type == "Soft")
+        found = skills_from_found(hits)
+    return _finish_parse(text, found, pages=page_hashes)
+
+def parse_document(data, file_type=None):
+    """
+    Extract, clean and analyse one document. Looks in the in-memory cache,
+    then the on-disk store, and only parses the file when both miss.
+    """
+    file_type = file_type or detect_file_type(data)
+    doc_hash = content_hash(data)
+    key = (doc_hash, file_type)
+
+    cached = DOCUMENT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    record = _load_stored(doc_hash, file_type)
+    if record is not None and record["skills"] is not None:
+        pages = tuple(record["pages"])
+        contact = record["contact"]
+        if contact is None:
+            # Stored before email/phone/GitHub were extracted
+            contact = extract_contact(record["text"])
+            _save_stored(doc_hash, file_type, ParsedDocument(record["text"], record["skills"], pages=pages, **contact))
+        doc = ParsedDocument(record["text"], record["skills"], pages=pages, **contact)
+    elif record is not None:
+        # Taxonomy changed since this was stored: text is still good
+        doc = replace(parse_text(record["text"]), pages=tuple(record["pages"]))
+        _save_stored(doc_hash, file_type, doc)
+    else:
+        try:
+            if file_type == PDF_TYPE:
+                # Page by page, so a revision only re-reads its changed pages
+                raw, page_hits, pages, truncated = _read_pdf_pages(data)
+            else:
+                with stage("ingest", file_type=file_type, bytes=len(data)):
+                    raw = extract_text_from_bytes(data, file_type)
+            with stage("clean", chars=len(raw)):
+                text = clean_text(raw)
+        except Exception as e:
+            # Failures are not cached so a transient error can be retried
+            return ParsedDocument("", [], error=str(e))
+        if file_type != PDF_TYPE:
+            doc = parse_text(text)
+        elif truncated:
+            # A partial read is only returned: caching or storing it would
+            # serve the truncated resume for this file from then on
+            return replace(_parse_pdf_text(text, page_hits, pages), truncated=True)
+        else:
+            doc = _parse_pdf_text(text, page_hits, pages)
+        _save_stored(doc_hash, file_type, doc)
+
+    DOCUMENT_CACHE.put(key, doc)
+    return doc
+
+# ================= REVISIONS =================
+
+def skill_changes(previous_skills, current_skills):
+    """(added, removed) skill names between two revisions of a document, each sorted"""
+    previous = {s["name"].lower(): s["name"] for s in previous_skills}
+    current = {s["name"].lower(): s["name"] for s in current_skills}
+    added = sorted((current[k] for k in current.keys() - previous.keys()), key=str.lower)
+    removed = sorted((previous[k] for k in previous.keys() - current.keys()), key=str.lower)
+    return added, removed
+
+def changed_pages(previous_pages, current_pages):
+    """1-based numbers of the pages in `current_pages` not found anywhere in `previous_pages`"""
+    previous = set(previous_pages)
+    return [n for n, page_hash in enumerate(current_pages, 1) if page_hash not in previous]
+
+def analyze(resume_bytes, jd_bytes, resume_type=None, jd_type=None):
+    """
+    Full pipeline: parse both documents, extract and merge skills,
+    and compute the skill gap. File types are sniffed when not given.
+    """
+    with stage("analyze"):
+        resume_doc = parse_document(resume_bytes, resume_type)
+        jd_doc = parse_document(jd_bytes, jd_type)
+        return build_result(resume_doc, jd_doc)
@@ -0,0 +1,182 @@
+"""
+Skill Gap AI - inverted skill index for recruiter-side candidate search.
+
+Maps every canonical skill (the lowercased output of
+normalize_and_merge_skills) to a posting list of resumes. Posting lists are
+Python ints used as bitmaps over resume slots, so a JD query is a handful of
+big-int AND/OR/XOR operations per JD skill regardless of how many resumes
+are indexed, followed by a bit-sliced top-k selection.
+
+Ranking uses the same exact/partial/missing rules as get_match_status:
+candidates are ordered by matched count, then partial count.
+"""
+
+from skill_analysis import PARTIAL_MATCHES, compute_skill_gap, normalize_skill
+
+def _popcount(x):
+    return bin(x).count("1")
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+
+def _iter_bits(x, limit=None):
+    """Yield set bit positions of x from lowest to highest"""
+    count = 0
+    while x and (limit is None or count < limit):
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+        count += 1
+
+def _add_to_counter(planes, mask):
+    """Bit-sliced add: every slot set in `mask` gets +1 in the planes counter"""
+    carry = mask
+    for i in range(len(planes)):
+        if not carry:
+            return
+        planes[i], carry = planes[i] ^ carry, planes[i] & carry
+    if carry:
+        planes.append(carry)
+
+def _bitmap_from_slots(slots):
+    """Build an int bitmap from many slot numbers in one allocation"""
+    slots = list(slots)
+    if not slots:
+        return 0
+    buf = bytearray(max(slots) // 8 + 1)
+    for slot in slots:
+        buf[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(buf, "little")
+
+class SkillIndex:
+    """Incrementally updatable skill -> resumes index"""
+
+    def __init__(self):
+        self.slot_ids = []      # slot -> resume id (None once removed)
+        self.slots = {}         # resume id -> slot
+        self.slot_skills = {}   # slot -> frozenset of normalized skill names
+        self.postings = {}      # skill -> bitmap of slots
+        self.live = 0           # bitmap of slots still in the index
+
+    def __len__(self):
+        return len(self.slots)
+
+    @staticmethod
+    def _skill_names(skills):
+        # Accept merged skill dicts or plain names
+        return frozenset(
+            normalize_skill(s["name"] if isinstance(s, dict) else s) for s in skills
+        )
+
+    def add(self, resume_id, skills):
+        """Index one resume; re-adding an id replaces its skills"""
+        if resume_id in self.slots:
+            self.remove(resume_id)
+
+        slot = len(self.slot_ids)
+        bit = 1 << slot
+        names = self._skill_names(skills)
+
+        self.slot_ids.append(resume_id)
+        self.slots[resume_id] = slot
+        self.slot_skills[slot] = names
+        for name in names:
+            self.postings[name] = self.postings.get(name, 0) | bit
+        self.live |= bit
+
+    def add_many(self, items):
+        """Bulk-index (resume_id, skills) pairs, building each posting list once"""
+        added = []
+        by_skill = {}
+        for resume_id, skills in items:
+            if resume_id in self.slots:
+                self.remove(resume_id)
+            slot = len(self.slot_ids)
+            names = self._skill_names(skills)
+            self.slot_ids.append(resume_id)
+            self.slots[resume_id] = slot
+            self.slot_skills[slot] = names
+            added.append(slot)
+            for name in names:
+                by_skill.setdefault(name, []).append(slot)
+
+        for name, slots in by_skill.items():
+            self.postings[name] = self.postings.get(name, 0) | _bitmap_from_slots(slots)
+        self.live |= _bitmap_from_slots(added)
+
+    def remove(self, resume_id):
+        slot = self.slots.pop(resume_id)
+        mask = ~(1 << slot)
+        for name in self.slot_skills.pop(slot):
+            posting = self.postings[name] & mask
+            if posting:
+                self.postings[name] = posting
+            else:
+                del self.postings[name]
+        self.live &= mask
+        self.slot_ids[slot] = None
+
+    def compact(self):
+        """Rebuild without the holes left by removed resumes"""
+        items = [(self.slot_ids[slot], names) for slot, names in sorted(self.slot_skills.items())]
+        self.__init__()
+        self.add_many(items)
+
+    def query(self, jd_skills, k=10):
+        """
+        Top-k resumes for a JD skill set, best first. Each hit is a dict with
+        the resume id, overall match % and the matched/partial/missing sets.
+        """
+        jd_names = self._skill_names(jd_skills)
+        if not jd_names or not self.live:
+            return []
+
+        matched_planes = []
+        partial_planes = []
+        for jd_skill in jd_names:
+            exact = self.postings.get(jd_skill, 0)
+            partial = 0
+            for name in PARTIAL_MATCHES.get(jd_skill, ()):
+                partial |= self.postings.get(name, 0)
+            partial &= ~exact
+
+            if exact:
+                _add_to_counter(matched_planes, exact)
+            if partial:
+                _add_to_counter(partial_planes, partial)
+
+        # Most significant plane first: matched count, then partial count
+        width = len(jd_names).bit_length()
+        matched_planes += [0] * (width - len(matched_planes))
+        partial_planes += [0] * (width - len(partial_planes))
+        key_planes = matched_planes[::-1] + partial_planes[::-1]
+
+        ranked = []
+        for slot in self._select_top(key_planes, k):
+            matched, partial, missing = compute_skill_gap(self.slot_skills[slot], jd_names)
+            ranked.append(((-len(matched), -len(partial), slot), {
+                "resume_id": self.slot_ids[slot],
+                "overall_match": int((len(matched) / len(jd_names)) * 100),
+                "matched": sorted(matched),
+                "partial": sorted(partial),
+                "missing": sorted(missing),
+            }))
+
+        ranked.sort(key=lambda pair: pair[0])
+        return [hit for _, hit in ranked]
+
+    def _select_top(self, key_planes, k):
+        """Radix-select the k best slots over bit-sliced keys (ties: oldest first)"""
+        selected = 0
+        candidates = self.live
+        need = k
+        for plane in key_planes:
+            higher = candidates & plane
+            n = _popcount(higher)
+            if n >= need:
+                candidates = higher
+            else:
+                selected |= higher
+                need -= n
+                candidates &= ~plane
+        return list(_iter_bits(selected)) + list(_iter_bits(candidates, need))
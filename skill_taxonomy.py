@@ -0,0 +1,113 @@
+"""
+Skill Gap AI - compiled skill taxonomy.
+
+All skill-equivalence knowledge lives in one JSON file (skill_taxonomy.json):
+
+- skills:          canonical id, name as extracted, type (Technical / Soft)
+- merge_rules:     ordered canonical -> variant substrings for merging
+- synonym_groups:  groups that make a JD skill a partial match
+- display:         exact and substring display-name overrides
+
+SkillTaxonomy compiles that file once into hash lookups, so matching a JD
+skill is a couple of dict/set probes instead of a scan over every group.
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+
+EMPTY = frozenset()
+
+def normalize_skill(skill):
+    return skill.lower().strip()
+
+class SkillTaxonomy:
+    """Immutable, precompiled view of a taxonomy file"""
+
+    def __init__(self, data):
+        self.data = data
+        payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+        # Skills in file order: extraction keeps this order within each type
+        self.skills = [(s["name"], s["type"]) for s in data["skills"]]
+        self.technical_skills = [name for name, kind in self.skills if kind == "Technical"]
+        self.soft_skills = [name for name, kind in self.skills if kind == "Soft"]
+
+        # First matching rule wins, so order is part of the data
+        self.merge_rules = {r["canonical"]: list(r["variants"]) for r in data["merge_rules"]}
+
+        self.synonym_groups = {"Technical": {}, "Soft": {}}
+        for group in data["synonym_groups"]:
+            self.synonym_groups[group["type"]][group["canonical"]] = list(group["variants"])
+
+        # variant -> canonical (later groups win, as the old lookup did)
+        self.synonym_lookup = {}
+        for canonical, variants in self.synonym_groups["Technical"].items():
+            for v in variants:
+                self.synonym_lookup[v] = canonical
+
+        # Technical: a JD variant is partially matched by its group's canonical or any variant
+        partial = {}
+        for canonical, variants in self.synonym_groups["Technical"].items():
+            for v in variants:
+                partial.setdefault(v, set()).update([canonical, *variants])
+        self.partial_matches = {v: frozenset(names) for v, names in partial.items()}
+
+        # Soft: only the group's canonical name has partial matches, through its variants
+        self.soft_partial_matches = {
+            canonical: frozenset(variants)
+            for canonical, variants in self.synonym_groups["Soft"].items()
+        }
+
+        display = data.get("display", {})
+        self.display_exact = dict(display.get("exact", {}))
+        self.display_contains = [(rule["text"], rule["display"]) for rule in display.get("contains", [])]
+        self.display = lru_cache(maxsize=8192)(self._display)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    # ================= MATCHING =================
+
+    def match_status(self, jd_skill, resume_norms):
+        """
+        get_match_status on a set of already-normalized resume skill names:
+        "exact", "partial" (synonym group) or "missing".
+        """
+        jd_norm = normalize_skill(jd_skill)
+        if jd_norm in resume_norms:
+            return "exact"
+        if not self.partial_matches.get(jd_norm, EMPTY).isdisjoint(resume_norms):
+            return "partial"
+        return "missing"
+
+    def soft_match_status(self, jd_skill, resume_norms):
+        """get_soft_skill_status on a set of already-normalized resume skill names"""
+        jd_norm = normalize_skill(jd_skill)
+        if jd_norm in resume_norms:
+            return "exact"
+        if not self.soft_partial_matches.get(jd_norm, EMPTY).isdisjoint(resume_norms):
+            return "partial"
+        return "missing"
+
+    def partial_match_for(self, jd_skill, resume_norms):
+        """The resume skill behind a partial match (alphabetically first), or None"""
+        hits = self.partial_matches.get(normalize_skill(jd_skill), EMPTY) & set(resume_norms)
+        return min(hits) if hits else None
+
+    # ================= DISPLAY =================
+
+    def _display(self, skill):
+        skill = skill.strip()
+        lower = skill.lower()
+
+        if lower in self.display_exact:
+            return self.display_exact[lower]
+        for text, display in self.display_contains:
+            if text in lower:
+                return display
+
+        return skill.title()
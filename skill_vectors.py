@@ -0,0 +1,148 @@
+"""
+Skill Gap AI - vectorized skill representation.
+
+A SkillVocabulary gives every normalized skill name a stable integer id
+(ids are only ever appended, never reassigned). Resumes and JDs become
+boolean rows over that vocabulary, and the exact / synonym-partial overlap
+for a whole resumes x JDs grid comes from two matrix products:
+
+    exact[r, j]   = R[r] . J[j]
+    partial[r, j] = (covers(R[r]) & ~R[r]) . J[j]
+
+where covers() marks every skill the resume partially matches through the
+synonym adjacency matrix (same rules as get_match_status).
+"""
+
+import numpy as np
+
+from skill_analysis import (
+    MERGE_RULES,
+    PARTIAL_MATCHES,
+    SOFT_SKILLS,
+    SYNONYM_MAP,
+    TECHNICAL_SKILLS,
+    normalize_skill,
+)
+
+class SkillVocabulary:
+    """Append-only mapping between normalized skill names and integer ids"""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize_skill(name) in self.ids
+
+    def add(self, name):
+        name = normalize_skill(name)
+        skill_id = self.ids.get(name)
+        if skill_id is None:
+            skill_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return skill_id
+
+    @staticmethod
+    def _names(skills):
+        # Accept merged skill dicts or plain names
+        return [s["name"] if isinstance(s, dict) else s for s in skills]
+
+    def encode(self, skills, grow=True):
+        """Boolean row for one skill list. Unknown skills are added when grow=True."""
+        return self.encode_many([skills], grow)[0]
+
+    def encode_many(self, skill_lists, grow=True):
+        """(n, len(vocab)) boolean matrix, one row per skill list"""
+        skill_lists = [self._names(skills) for skills in skill_lists]
+        if grow:
+            for skills in skill_lists:
+                for name in skills:
+                    self.add(name)
+
+        rows = np.zeros((len(skill_lists), len(self)), dtype=bool)
+        for i, skills in enumerate(skill_lists):
+            ids = [self.ids[n] for n in map(normalize_skill, skills) if n in self.ids]
+            rows[i, ids] = True
+        return rows
+
+    def decode(self, row):
+        return [self.names[i] for i in np.flatnonzero(row)]
+
+    def partial_adjacency(self):
+        """
+        (V, V) 0/1 matrix: adjacency[j, r] is 1 when a resume skill r makes
+        JD skill j a partial match (see PARTIAL_MATCHES). float32, the type
+        the scoring products need, so it is converted once, not per query.
+        """
+        adjacency = np.zeros((len(self), len(self)), dtype=np.float32)
+        for jd_name, resume_names in PARTIAL_MATCHES.items():
+            j = self.ids.get(jd_name)
+            if j is None:
+                continue
+            cols = [self.ids[r] for r in resume_names if r in self.ids]
+            adjacency[j, cols] = 1
+        return adjacency
+
+def default_vocabulary():
+    """Every skill name the extractor, merge rules or synonym maps can produce"""
+    names = [s.lower() for s in TECHNICAL_SKILLS + SOFT_SKILLS]
+    names += list(MERGE_RULES)
+    for canonical, variants in SYNONYM_MAP.items():
+        names += [canonical, *variants]
+    return SkillVocabulary(sorted(set(map(normalize_skill, names))))
+
+# ================= PACKED BITSETS =================
+
+def pack_rows(rows):
+    """Boolean rows -> packed uint8 bitsets (8x smaller, for storage)"""
+    return np.packbits(rows, axis=1)
+
+def unpack_rows(packed, width):
+    return np.unpackbits(packed, axis=1, count=width).astype(bool)
+
+def pad_rows(rows, width):
+    """Widen rows encoded against an older (smaller) vocabulary"""
+    if rows.shape[1] >= width:
+        return rows
+    return np.pad(rows, ((0, 0), (0, width - rows.shape[1])))
+
+# ================= SCORING =================
+
+def _float32(matrix):
+    # No copy when the caller already holds a float32 matrix
+    return np.asarray(matrix, dtype=np.float32)
+
+def partial_coverage(resume_rows, adjacency):
+    """Skills each resume matches only partially (synonym hit, no exact hit)"""
+    covers = (_float32(resume_rows) @ _float32(adjacency).T) > 0
+    return covers & ~resume_rows
+
+def score_matrix(resume_rows, jd_rows, vocab, adjacency=None):
+    """
+    Exact/partial/missing counts and overall match % for every resume x JD
+    pair. Returns a dict of (n_resumes, n_jds) arrays; overall_match is
+    computed exactly like the dashboard's int(matched / total * 100).
+    jd_rows may be boolean or already float32 (see JDLibrary.matrix_f32),
+    which saves converting a large JD matrix on every call.
+    """
+    width = len(vocab)
+    resume_rows = pad_rows(resume_rows, width)
+    jd_rows = pad_rows(jd_rows, width)
+    if adjacency is None:
+        adjacency = vocab.partial_adjacency()
+
+    jd_f = _float32(jd_rows).T
+    exact = (_float32(resume_rows) @ jd_f).astype(np.int32)
+    partial = (partial_coverage(resume_rows, adjacency).astype(np.float32) @ jd_f).astype(np.int32)
+
+    jd_sizes = jd_rows.sum(axis=1).astype(np.int32)
+    missing = jd_sizes[None, :] - exact - partial
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overall = np.where(jd_sizes > 0, np.floor(exact / jd_sizes * 100), 0).astype(np.int32)
+
+    return {"exact": exact, "partial": partial, "missing": missing, "overall_match": overall}
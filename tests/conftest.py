@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests never touch the on-disk document store
+os.environ["SKILL_GAP_STORE"] = ""
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
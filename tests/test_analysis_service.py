@@ -0,0 +1,41 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+from analysis_service import AnalysisService, RequestError, _read_request
+
+def read(raw):
+    async def go():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_request(reader)
+    return asyncio.run(go())
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1e3", "²"])
+def test_invalid_content_length_is_a_bad_request(length):
+    with pytest.raises(RequestError) as e:
+        read(f"POST /jd HTTP/1.1\r\nContent-Length: {length}\r\n\r\n{{}}".encode("latin-1"))
+    assert e.value.status == HTTPStatus.BAD_REQUEST
+
+    assert read(b"POST /jd HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}")[3] == b"{}"
+
+def test_batch_is_admitted_before_a_request_behind_it():
+    async def go():
+        service = AnalysisService(workers=2, queue_factor=1, use_store=False)
+        try:
+            jd_id = (await service.precompile_jd({"jd_text": "Python, SQL, Teamwork"}))["jd_id"]
+            resumes = [{"id": i, "text": "Python\nExcel"} for i in range(40)]
+            # The batch takes both slots (two chunks); the analyze request
+            # scheduled right behind it must not get one of them first
+            batch = asyncio.create_task(service.batch({"jd_id": jd_id, "resumes": resumes}))
+            single = asyncio.create_task(service.analyze({"jd_id": jd_id, "resume_text": "SQL"}))
+            return await asyncio.gather(batch, single, return_exceptions=True), service.pending
+        finally:
+            service.close()
+
+    (batch, single), pending = asyncio.run(go())
+    assert len(batch["results"]) == 40
+    assert isinstance(single, RequestError) and single.status == HTTPStatus.TOO_MANY_REQUESTS
+    assert pending == 0
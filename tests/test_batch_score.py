@@ -0,0 +1,39 @@
+import json
+import os
+
+import batch_score
+
+def scored_files(out):
+    with open(out, encoding="utf-8") as f:
+        return [json.loads(line)["file"] for line in f]
+
+def test_rerun_skips_only_unchanged_files(tmp_path):
+    resumes = tmp_path / "resumes"
+    resumes.mkdir()
+    (resumes / "a.txt").write_text("Jane Doe\nPython, SQL\n")
+    (resumes / "b.txt").write_text("John Roe\nExcel, Git\n")
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Required: Python, SQL, Excel")
+    out = str(tmp_path / "scores.jsonl")
+
+    def rerun():
+        before = len(scored_files(out)) if os.path.exists(out) else 0
+        assert batch_score.run(str(resumes), [str(jd)], out, 1, False, 0) == 0
+        return sorted(scored_files(out)[before:])
+
+    assert rerun() == ["a.txt", "b.txt"]
+    assert rerun() == []
+
+    # Touched but identical: the hash says it was already scored
+    os.utime(resumes / "a.txt", ns=(0, 10**18))
+    assert rerun() == []
+
+    # Same size, new content: the hash catches it
+    stat = os.stat(resumes / "b.txt")
+    (resumes / "b.txt").write_text("John Roe\nExcel, SQL\n")
+    os.utime(resumes / "b.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert rerun() == ["b.txt"]
+
+    (resumes / "a.txt").write_text("Jane Doe\nPython, SQL, Excel\n")
+    assert rerun() == ["a.txt"]
+    assert rerun() == []
@@ -0,0 +1,52 @@
+import multiprocessing
+
+from document_store import DocumentStore
+
+_store = None
+
+def _child_writes(doc_hash):
+    conn = _store._connect()
+    _store.put(doc_hash, "text/plain", "Python", [], {"name": "Jane Doe"})
+    return id(conn)
+
+def test_forked_child_opens_its_own_connection(tmp_path):
+    global _store
+    _store = DocumentStore(str(tmp_path / "store.sqlite3"), "x", "t")
+    parent = id(_store._connect())
+
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        children = pool.map(_child_writes, ["a", "b", "c", "d"])
+    assert parent not in children
+
+    # The parent's connection still works and sees the children's writes
+    assert id(_store._connect()) == parent
+    assert _store.stats()["documents"] == 4
+    assert _store.get("c", "text/plain")["text"] == "Python"
+
+def _summed(store):
+    return store.stats()["bytes"]
+
+def _running_total(store):
+    return store._connect().execute("SELECT bytes FROM store_size").fetchone()[0]
+
+def test_running_total_follows_writes_and_eviction(tmp_path):
+    store = DocumentStore(str(tmp_path / "store.sqlite3"), "x", "t", max_bytes=2000)
+    for i in range(30):
+        store.put(f"doc{i % 12}", "text/plain", "Python " * (i + 1), ["python"], {"name": "Jane Doe"})
+        store.put_pages("pdfplumber", [(f"page{j}", "SQL " * j, []) for j in range(i % 5)])
+        assert _running_total(store) == _summed(store) <= 2000
+    assert store.get("doc5", "text/plain") is not None  # recently written rows survive
+
+def test_opening_with_a_new_extractor_version_drops_the_old_rows(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    old = DocumentStore(path, "1", "t")
+    old.put("a", "text/plain", "Python", [], {})
+    old.put_pages("pdfplumber", [("p", "SQL", [])])
+
+    retagged = DocumentStore(path, "1", "t2")  # same extractor: text is still reused
+    assert retagged.get("a", "text/plain")["skills"] is None
+    assert retagged.stats()["documents"] == 1
+
+    new = DocumentStore(path, "2", "t2")
+    assert new.stats() == {"documents": 0, "pages": 0, "bytes": 0, "max_bytes": new.max_bytes}
+    assert _running_total(new) == 0
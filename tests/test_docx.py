@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+from text_extraction import extract_docx_text_python_docx, extract_docx_text_xml
+
+docx = pytest.importorskip("docx")
+
+def make_docx():
+    from docx.enum.text import WD_BREAK
+    from docx.shared import Inches
+
+    doc = docx.Document()
+    doc.add_paragraph("Jane Doe")
+    heading = doc.add_paragraph()
+    heading.paragraph_format.tab_stops.add_tab_stop(Inches(3))  # w:tab under w:pPr/w:tabs
+    heading.add_run("TECHNICAL SKILLS")
+    para = doc.add_paragraph()
+    para.add_run("Python\tSQL • Excel")
+    para.add_run().add_break()
+    para.add_run("Power BI")
+    para.add_run().add_break(WD_BREAK.PAGE)
+    para.add_run("Tableau")
+
+    table = doc.add_table(rows=3, cols=3)
+    table.cell(0, 0).text = "Skills"
+    table.cell(0, 1).text = "Python"
+    table.cell(1, 1).text = "SQL"
+    table.cell(0, 0).merge(table.cell(1, 0))  # vertical merge
+    table.cell(2, 1).merge(table.cell(2, 2))  # horizontal merge
+    table.cell(2, 0).text = "Tools"
+    table.cell(2, 1).text = "Git"
+    table.cell(0, 2).add_table(rows=1, cols=2).cell(0, 0).text = "Nested"
+
+    doc.add_paragraph("Soft Skills: Teamwork")
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+def test_both_backends_read_the_same_text():
+    data = make_docx()
+    text = extract_docx_text_xml(data)
+    assert text == extract_docx_text_python_docx(data)
+
+    lines = text.split("\n")
+    assert lines[1] == "TECHNICAL SKILLS"  # the tab stop adds no tab
+    assert "Python\tSQL   Excel" in lines
+    assert "Power BITableau" in lines  # a page break is no line break
+    # A merged cell is read once, in the row it starts in
+    assert "Skills | Python | Nested" in lines
+    assert "SQL" in lines
+    assert "Tools | Git" in lines
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+TEXT_BOX = f"""
+<w:r {W} xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"
+    xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"
+    xmlns:v="urn:schemas-microsoft-com:vml">
+  <mc:AlternateContent>
+    <mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>
+      <w:p><w:r><w:t>Sidebar: Excel</w:t></w:r></w:p>
+      <w:tbl><w:tr><w:tc><w:p><w:r><w:t>Boxed cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+    </w:txbxContent></wps:txbx></w:drawing></mc:Choice>
+    <mc:Fallback><w:pict><v:textbox><w:txbxContent>
+      <w:p><w:r><w:t>Sidebar: Excel</w:t></w:r></w:p>
+    </w:txbxContent></v:textbox></w:pict></mc:Fallback>
+  </mc:AlternateContent>
+</w:r>"""
+
+def test_text_boxes_and_content_controls_read_like_python_docx():
+    from docx.oxml import parse_xml
+
+    doc = docx.Document()
+    anchor = doc.add_paragraph("Jane Doe ")
+    anchor._p.append(parse_xml(TEXT_BOX))
+    anchor.add_run("Analyst")
+    doc.element.body.append(parse_xml(
+        f'<w:sdt {W}><w:sdtContent><w:p><w:r><w:t>Git</w:t></w:r></w:p></w:sdtContent></w:sdt>'))
+    linked = doc.add_paragraph("Portfolio: ")
+    linked._p.append(parse_xml(f'<w:hyperlink {W}><w:r><w:t>janedoe.dev</w:t></w:r></w:hyperlink>'))
+    doc.add_table(rows=1, cols=1).cell(0, 0).paragraphs[0]._p.append(parse_xml(TEXT_BOX))
+    doc.element.body.append(doc.element.body.sectPr)  # keep w:sectPr last
+    out = io.BytesIO()
+    doc.save(out)
+    data = out.getvalue()
+
+    text = extract_docx_text_xml(data)
+    assert text == extract_docx_text_python_docx(data)
+    assert text.split("\n") == ["Jane Doe Analyst", "Portfolio: janedoe.dev", ""]
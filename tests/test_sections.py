@@ -0,0 +1,110 @@
+import random
+import re
+
+from skill_analysis import (
+    SOFT_SKILLS,
+    TECHNICAL_SKILLS,
+    extract_additional_technical_terms,
+    extract_professional_summary,
+    extract_skills,
+    segment,
+    soft_skills_window,
+)
+
+PROSE_RESUME = (
+    "Jane Doe\n"
+    "PROFILE\n"
+    "Data analyst with strong soft skills such as communication and teamwork.\n"
+    "Education: B.Tech, NSS Leadership training programme\n"
+    "TECHNICAL SKILLS\n"
+    "Python, SQL\n"
+    "Worked on Tableau dashboards\n"
+)
+
+def previous_soft_window(text):
+    """The split-based window used before documents were segmented"""
+    lower = text.lower()
+    if "soft skills" not in lower:
+        return None
+    before, remaining = lower.split("soft skills", 1)
+    for phrase in ["education", "projects", "experience", "certification", "hobbies", "declaration"]:
+        if phrase in remaining:
+            remaining = remaining.split(phrase, 1)[0]
+    start = len(before) + len("soft skills")
+    return start, start + len(remaining[:2000])
+
+def test_soft_skills_in_prose_stop_at_education():
+    names = [s["name"] for s in extract_skills(PROSE_RESUME)]
+    assert "Communication" in names and "Teamwork" in names
+    assert "Leadership" not in names  # from the education line
+
+def test_soft_skills_without_a_heading_use_the_previous_window():
+    rng = random.Random(0)
+    for _ in range(200):
+        lines = [", ".join(rng.sample(TECHNICAL_SKILLS, 3)) for _ in range(4)]
+        lines.insert(rng.randrange(5), "Known for soft skills like " + ", ".join(rng.sample(SOFT_SKILLS, 3)))
+        lines.insert(rng.randrange(6), rng.choice(["Education", "Projects done", "Hobbies", "Declaration"]))
+        text = "\n".join(lines)
+        assert soft_skills_window(segment(text)) == previous_soft_window(text)
+
+def test_soft_skills_window_follows_the_heading():
+    text = "Python\nSoft Skills:\nTeamwork, Leadership\nEDUCATION\nLeadership club"
+    sections = segment(text)
+    lo, hi = soft_skills_window(sections)
+    assert "teamwork, leadership" in sections.lower[lo:hi]
+    assert "club" not in sections.lower[lo:hi]
+    assert soft_skills_window(segment("Python, SQL\nTeamwork")) is None
+
+def test_technical_terms_only_come_from_keyword_lines():
+    assert extract_additional_technical_terms(PROSE_RESUME) == ["Data", "TECHNICAL", "SKILLS"]
+
+# ----- one segmentation pass against the line scans it replaced -----
+
+def line_scan_terms(text):
+    """extract_additional_technical_terms as it was: every line lowered and tested"""
+    results, seen = [], set()
+    for line in text.split("\n"):
+        if any(k in line.lower() for k in ["technical", "skills", "tools", "technologies", "hardware"]):
+            for t in re.findall(r"\b[A-Z][A-Za-z0-9\-]{2,}\b", line):
+                if t.lower() not in seen:
+                    seen.add(t.lower())
+                    results.append(t)
+    return results
+
+SUMMARY_STARTS = ["PROFESSIONAL SUMMARY", "SUMMARY", "CAREER OBJECTIVE", "OBJECTIVE", "PROFILE", "ABOUT ME"]
+SUMMARY_STOPS = ["TECHNICAL SKILLS", "SOFT SKILLS", "SKILLS", "PROJECTS", "EDUCATION", "EXPERIENCE",
+                 "CERTIFICATIONS", "ACHIEVEMENTS"]
+
+def line_scan_summary(text):
+    """extract_professional_summary as it was, scanning lines for its own header lists"""
+    collected, capturing = [], False
+    for line in re.sub(r"\n{2,}", "\n", text).split("\n"):
+        clean = line.strip()
+        upper = clean.upper()
+        header = next((h for h in SUMMARY_STARTS if upper.startswith(h)), None)
+        if header is not None:
+            capturing = True
+            if clean[len(header):].strip(" :-"):
+                collected.append(clean[len(header):].strip(" :-"))
+        elif capturing:
+            if any(upper.startswith(h) for h in SUMMARY_STOPS):
+                break
+            if clean:
+                collected.append(clean)
+    summary = " ".join(collected).strip()
+    return summary if len(summary) >= 30 else "Professional summary not clearly specified in the resume."
+
+def test_sections_give_the_line_scan_results():
+    rng = random.Random(4)
+    for _ in range(1000):
+        blocks = []
+        for head in rng.sample(SUMMARY_STOPS, 3) + [rng.choice(SUMMARY_STARTS)]:
+            block = [rng.choice([head, head.title() + ":", head + ":"])]
+            for _ in range(rng.randint(0, 3)):
+                used = ", ".join(rng.sample(TECHNICAL_SKILLS, 3))
+                block.append(rng.choice(["", "  ", "Tools used: ", "Hardware "]) + f"Built {used} pipelines for the team")
+            blocks.append(block)
+        rng.shuffle(blocks)
+        text = "\n".join(["Jane Doe"] + [line for block in blocks for line in block])
+        assert extract_additional_technical_terms(text) == line_scan_terms(text), text
+        assert extract_professional_summary(text) == line_scan_summary(text), text
@@ -0,0 +1,53 @@
+import dataclasses
+import random
+import re
+
+import pytest
+
+from skill_analysis import SOFT_SKILLS, TECHNICAL_SKILLS, build_result, extract_skills, parse_text
+
+def test_result_does_not_share_skill_dicts_with_the_parsed_documents():
+    resume, jd = parse_text("Python, SQL\nTeamwork"), parse_text("Python, Excel")
+    result = build_result(resume, jd)
+    assert list(result.resume_skills) == resume.skills
+    assert not {id(s) for s in result.resume_skills} & {id(s) for s in resume.skills}
+    assert not {id(s) for s in result.jd_skills} & {id(s) for s in jd.skills}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.overall_match = 100
+
+# ----- single-pass scanner against the per-skill regex loop it replaced -----
+
+def regex_skills(text):
+    """extract_skills as it was: one regex search per known skill"""
+    lower = text.lower()
+    soft_text = lower
+    if "soft skills" in lower:
+        remaining = lower.split("soft skills", 1)[1]
+        for phrase in ["education", "projects", "experience", "certification", "hobbies", "declaration"]:
+            if phrase in remaining:
+                remaining = remaining.split(phrase, 1)[0]
+        soft_text = remaining[:2000]
+
+    skills, seen = [], set()
+    for names, kind, confidence, haystack in ((TECHNICAL_SKILLS, "Technical", 92, lower),
+                                             (SOFT_SKILLS, "Soft", 88, soft_text)):
+        for skill in names:
+            if re.search(r"\b" + re.escape(skill.lower()) + r"\b", haystack) and skill.lower() not in seen:
+                skills.append({"name": skill, "type": kind, "confidence": confidence})
+                seen.add(skill.lower())
+
+    has_embedded_c = any("embedded c" in s["name"].lower() for s in skills)
+    return [s for s in skills
+            if not (s["name"].lower().strip() in ["c", "c programming", "c language"] and has_embedded_c)
+            and s["name"].lower().strip() not in ["sensor", "sensors"]]
+
+def test_scanner_finds_what_the_regex_loop_found():
+    rng = random.Random(1)
+    words = TECHNICAL_SKILLS + SOFT_SKILLS + [
+        "strong soft skills like", "education", "projects", "x", "_", "++", "-", "embedded c++",
+        "arduinonano", "c#", "ç", "İ", "Sensor", "C", "c language",
+    ]
+    for _ in range(2000):
+        parts = rng.choices(words, k=rng.randint(0, 40))
+        text = "".join(p + rng.choice([" ", "", "\n", ", ", "_", "-", "."]) for p in parts)
+        assert extract_skills(text) == regex_skills(text), text
@@ -0,0 +1,88 @@
+import random
+
+from skill_analysis import (
+    MERGE_ENGINE,
+    MERGE_RULES,
+    SOFT_SKILL_SYNONYMS,
+    SOFT_SKILLS,
+    SYNONYM_MAP,
+    TECHNICAL_SKILLS,
+    MergeEngine,
+    display_skill,
+    get_match_status,
+    get_soft_skill_status,
+)
+
+# ----- compiled taxonomy against the functions it replaced -----
+
+def linear_match_status(jd_skill, resume_skills):
+    """get_match_status as it was: a scan of SYNONYM_MAP per call"""
+    jd_norm = jd_skill.lower().strip()
+    if any(r.lower().strip() == jd_norm for r in resume_skills):
+        return "exact"
+    for canonical, variants in SYNONYM_MAP.items():
+        if jd_norm in variants:
+            for r in resume_skills:
+                if r.lower().strip() == canonical or r.lower().strip() in variants:
+                    return "partial"
+    return "missing"
+
+def linear_soft_status(jd_skill, resume_skills):
+    jd_norm = jd_skill.lower().strip()
+    if any(r.lower().strip() == jd_norm for r in resume_skills):
+        return "exact"
+    if any(r.lower().strip() in SOFT_SKILL_SYNONYMS.get(jd_norm, ()) for r in resume_skills):
+        return "partial"
+    return "missing"
+
+def hardcoded_display(skill):
+    """display_skill as it was, before its rules moved to skill_taxonomy.json"""
+    skill = skill.strip()
+    lower = skill.lower()
+    if lower == "sql":
+        return "SQL"
+    if "verilog" in lower:
+        return "Verilog HDL"
+    if "ir " in lower or "ir sensor" in lower:
+        return "IR Sensor"
+    if "embedded c" in lower:
+        return "Embedded C"
+    if lower == "c":
+        return "C"
+    return skill.title()
+
+def test_compiled_taxonomy_answers_like_the_linear_scans():
+    names = {v for group in (SYNONYM_MAP, SOFT_SKILL_SYNONYMS) for k, vs in group.items() for v in [k, *vs]}
+    pool = sorted(names | {s.lower() for s in TECHNICAL_SKILLS + SOFT_SKILLS})
+    pool += [" Python ", "SQL", "Ir Sensor", "fair x", "verilog", "c", "Data Viz", ""]
+    rng = random.Random(2)
+    for _ in range(5000):
+        jd = rng.choice(pool)
+        resume = rng.sample(pool, rng.randint(0, 10))
+        assert get_match_status(jd, resume) == linear_match_status(jd, resume), (jd, resume)
+        assert get_soft_skill_status(jd, resume) == linear_soft_status(jd, resume), (jd, resume)
+        assert display_skill(jd) == hardcoded_display(jd), jd
+
+# ----- merge engine against the nested rule loops it replaced -----
+
+def first_rule(rules, name_lower):
+    for canon, variants in rules.items():
+        if any(v in name_lower for v in variants) or name_lower == canon:
+            return canon
+    return None
+
+def test_merge_engine_picks_the_first_matching_rule():
+    rng = random.Random(3)
+
+    def word():
+        return "".join(rng.choice("abc d") for _ in range(rng.randint(0, 5)))
+
+    for _ in range(300):
+        rules = {word(): [word() for _ in range(rng.randint(0, 5))] for _ in range(rng.randint(1, 30))}
+        engine = MergeEngine(rules)
+        for _ in range(30):
+            name = word() + word()
+            assert engine.canonical(name) == first_rule(rules, name), (rules, name)
+
+    for name in [s.lower() for s in TECHNICAL_SKILLS + SOFT_SKILLS] + ["arduino-nano", "ms excel 2019", "mcu"]:
+        assert MERGE_ENGINE.canonical(name) == first_rule(MERGE_RULES, name), name
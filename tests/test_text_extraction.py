@@ -0,0 +1,116 @@
+import random
+import time
+
+import pytest
+
+import skill_analysis
+import text_extraction
+from skill_analysis import PDF_TYPE, SOFT_SKILLS, TECHNICAL_SKILLS, changed_pages, parse_document
+from text_extraction import Deadline, extract_with_policy, iter_pdf_page_texts, pdf_page_fingerprints
+
+def make_pdf(pages):
+    fpdf = pytest.importorskip("fpdf")
+    pdf = fpdf.FPDF()
+    pdf.set_font("Helvetica", size=10)
+    for lines in pages:
+        pdf.add_page()
+        for line in lines:
+            pdf.cell(0, 5, line, ln=1)
+    out = pdf.output(dest="S")
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+RESUME_PAGES = [
+    ["Jane Doe", "jane.doe@gmail.com", "TECHNICAL SKILLS", "Python, SQL, Power BI"],
+    ["PROJECTS", "Built dashboards with Pandas and Excel"],
+    ["Soft Skills:", "Teamwork, Communication"],
+]
+
+@pytest.fixture
+def fresh_pool():
+    text_extraction.shutdown_executor()
+    yield
+    text_extraction.shutdown_executor()
+
+def test_spent_deadline_reads_nothing_and_is_cut_short(fresh_pool):
+    data = make_pdf(RESUME_PAGES)
+    deadline = Deadline(0)
+    assert list(iter_pdf_page_texts(data, [0, 1, 2], "pdfplumber", deadline)) == []
+    assert deadline.cut_short
+
+    deadline = Deadline()
+    assert [n for n, _ in iter_pdf_page_texts(data, [2, 0], "pdfplumber", deadline)] == [0, 2]
+    assert not deadline.cut_short
+
+def test_fingerprinting_stops_at_the_deadline():
+    data = make_pdf(RESUME_PAGES)
+    deadline = Deadline(0)
+    assert pdf_page_fingerprints(data, deadline=deadline) == []
+    assert deadline.cut_short
+    assert len(pdf_page_fingerprints(data, deadline=Deadline())) == 3
+
+def _stuck_on_page_one(data, page_numbers, backend, deadline):
+    for n in page_numbers:
+        if n == 1:
+            time.sleep(3600)
+        yield n, f"page {n}"
+
+def test_worker_stuck_inside_a_page_is_killed(fresh_pool, monkeypatch):
+    # Workers are forked on first use, so they inherit the patched reader
+    monkeypatch.setattr(text_extraction, "_iter_page_list", _stuck_on_page_one)
+    monkeypatch.setattr(text_extraction, "STUCK_GRACE", 0.2)
+    monkeypatch.setattr(text_extraction, "PAGES_PER_CHUNK", 1)
+
+    start = time.monotonic()
+    deadline = Deadline(0.5)
+    pages = list(iter_pdf_page_texts(b"", [0, 1, 2], "pdfplumber", deadline))
+    assert time.monotonic() - start < 5
+    assert pages == [(0, "page 0")]
+    assert deadline.cut_short
+
+    # The stuck pool was replaced; reading goes on with a fresh one
+    monkeypatch.undo()
+    data = make_pdf(RESUME_PAGES)
+    assert len(list(iter_pdf_page_texts(data, [0, 1, 2], "pdfplumber"))) == 3
+
+def test_truncated_document_is_not_cached(fresh_pool, monkeypatch):
+    data = make_pdf(RESUME_PAGES)
+    skill_analysis.DOCUMENT_CACHE.clear()
+
+    monkeypatch.setattr(skill_analysis, "Deadline", lambda: Deadline(0))
+    doc = parse_document(data, PDF_TYPE)
+    assert doc.truncated and not doc.error
+    assert skill_analysis.DOCUMENT_CACHE.get((skill_analysis.content_hash(data), PDF_TYPE)) is None
+
+    monkeypatch.undo()
+    doc = parse_document(data, PDF_TYPE)
+    assert not doc.truncated
+    assert {"Python", "Pandas", "Teamwork"} <= {s["name"] for s in doc.skills}
+    assert skill_analysis.DOCUMENT_CACHE.get((skill_analysis.content_hash(data), PDF_TYPE)) is doc
+
+def revised_pages(rng):
+    lines = []
+    for head in rng.sample(["TECHNICAL SKILLS", "Soft Skills:", "PROJECTS", "EDUCATION", "EXPERIENCE"], 3):
+        pool = SOFT_SKILLS + TECHNICAL_SKILLS if head.startswith("Soft") else TECHNICAL_SKILLS + SOFT_SKILLS[:5]
+        lines += [head] + [", ".join(rng.sample(pool, 4)) + " and teamwork" for _ in range(rng.randint(1, 4))]
+    return lines
+
+def whole_document(data):
+    raw, _ = extract_with_policy(data, "pdf")
+    return skill_analysis.parse_text(skill_analysis.clean_text(raw))
+
+def test_page_cached_parse_matches_a_whole_document_parse(fresh_pool):
+    rng = random.Random(5)
+    for _ in range(3):
+        pages = [["Jane Doe", "jane.doe@gmail.com"] + revised_pages(rng)] + [revised_pages(rng) for _ in range(3)]
+        skill_analysis.DOCUMENT_CACHE.clear()
+        skill_analysis.PAGE_CACHE.clear()
+        first = parse_document(make_pdf(pages), PDF_TYPE)
+
+        # Revise one page: only it is read again, the others come from the page cache
+        k = rng.randrange(len(pages))
+        pages[k] = revised_pages(rng)
+        data = make_pdf(pages)
+        revised = parse_document(data, PDF_TYPE)
+        expected = whole_document(data)
+        assert (revised.text, revised.skills, revised.contact()) == (expected.text, expected.skills, expected.contact())
+        assert changed_pages(first.pages, revised.pages) == [k + 1]
@@ -0,0 +1,509 @@
+"""
+Skill Gap AI - document text extraction.
+
+PDF pages are read in a process pool, a few pages per task, and streamed
+back in order. Every document is capped in pages and wall time (one
+Deadline shared by all its reads), and a worker stuck inside one page is
+killed, so one pathological file cannot stall the server. Pages can also
+be fingerprinted and read selectively, so a revised PDF only has its
+changed pages extracted again.
+
+Several extraction backends are available per format. A policy picks the
+order they are tried in, and a cheap backend whose output looks degenerate
+(almost no text, or mostly cid garbage) falls back to the next one.
+"""
+
+import hashlib
+import io
+import multiprocessing.util
+import os
+import re
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+# pdfplumber / pdfminer / python-docx are imported inside the functions that
+# need them: importing this module (e.g. on the landing page) stays cheap.
+
+# Bump whenever a change here (or in clean_text) alters the extracted text,
+# so persisted documents from older code are ignored
+EXTRACTOR_VERSION = "5"
+
+# ================= LIMITS =================
+
+MAX_PAGES = 50              # pages read per document, the rest is ignored
+TIME_BUDGET = 20.0          # seconds per document before we stop reading
+PAGES_PER_CHUNK = 4         # pages handed to one worker at a time
+STUCK_GRACE = 2.0           # seconds past the deadline before a busy worker is killed
+POOL_WORKERS = min(4, os.cpu_count() or 1)
+
+class Deadline:
+    """
+    The time budget of one document, shared by every step that reads it
+    (fingerprinting, then each backend tried in turn). Readers that stop
+    because it ran out set `cut_short`, so callers can tell a truncated
+    document from a complete one. Picklable: page workers get a copy.
+    """
+
+    def __init__(self, seconds=TIME_BUDGET):
+        self.expires = time.monotonic() + seconds
+        self.cut_short = False
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _init_page_worker():
+    import pdfplumber  # noqa: F401 - paid once per worker, not on its first page
+
+def get_executor(workers=None):
+    """Process pool shared by every extraction in this process"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers or POOL_WORKERS, initializer=_init_page_worker)
+        return _executor
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def _discard_executor(executor):
+    """
+    Kill a pool with a worker stuck inside one page past its deadline. A
+    running task cannot be cancelled, so its processes are terminated and
+    the next get_executor() starts a fresh pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    # ProcessPoolExecutor has no public way to stop a running worker
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def use_single_page_worker():
+    """
+    For processes that are themselves pool workers (batch scoring, the HTTP
+    service, screening): files are already spread over that pool, so PDFs
+    get a page pool of one process, there only so a stuck page can be
+    abandoned at the deadline. Call it first thing in the worker: a pool
+    inherited from the parent over fork cannot be used from the child.
+    """
+    global POOL_WORKERS, _executor, _executor_lock
+    POOL_WORKERS = 1
+    _executor = None
+    _executor_lock = threading.Lock()
+    # A pool worker joins its child processes on exit, before any atexit
+    # hook could stop this pool, and its idle page worker never leaves on
+    # its own then: kill it from a finalizer that runs before the join
+    multiprocessing.util.Finalize(None, _kill_executor, exitpriority=10)
+
+def _kill_executor():
+    if _executor is not None:
+        _discard_executor(_executor)
+
+# ================= PDF =================
+
+def pdf_page_count(data, max_pages=MAX_PAGES):
+    """Number of pages in the PDF, at most `max_pages`"""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    pages = PDFPage.create_pages(PDFDocument(PDFParser(io.BytesIO(data))))
+    return sum(1 for _ in islice(pages, max_pages))
+
+def iter_pdf_pages(data, max_pages=MAX_PAGES, deadline=None, workers=None, layout=True):
+    """
+    Yield the text of each PDF page, in page order ("" for empty pages).
+
+    - max_pages: only the first N pages are read
+    - deadline: a Deadline (a fresh TIME_BUDGET one when None); once spent,
+      the generator stops early, marks it cut_short, and the document is
+      treated as ending at the last page already read
+    """
+    backend = "pdfplumber-layout" if layout else "pdfplumber"
+    page_numbers = range(pdf_page_count(data, max_pages))
+    for _, text in iter_pdf_page_texts(data, page_numbers, backend, deadline, workers):
+        yield text
+
+def extract_pdf_text(data, **options):
+    """Whole-document PDF text, one page per chunk, empty pages skipped"""
+    return "".join(page + "\n" for page in iter_pdf_pages(data, **options) if page)
+
+def extract_pdf_text_pdfminer(data, max_pages=MAX_PAGES, deadline=None, workers=None):
+    """Raw pdfminer text per page, no pdfplumber object model on top"""
+    page_numbers = range(pdf_page_count(data, max_pages))
+    pages = iter_pdf_page_texts(data, page_numbers, "pdfminer", deadline, workers)
+    return "".join(text + "\n" for _, text in pages if text)
+
+# ================= PER-PAGE EXTRACTION =================
+
+# Revisions of a resume usually change one page. Each page gets a
+# fingerprint of everything its text depends on (content streams, fonts and
+# other resources, page boxes, rotation), so unchanged pages can be reused
+# from a cache and only the changed ones are extracted again.
+
+# Entries left out of a fingerprint: back-references and annotations, and
+# graphics-only resources (shadings, patterns, transparency, Type3 glyph
+# drawings) that never reach the extracted text but can be thousands of
+# objects to parse. Fonts, encodings and form XObjects are all hashed.
+_FINGERPRINT_SKIP = frozenset({
+    "Parent", "P", "Annots", "Thumb", "StructParents", "Metadata",
+    "Shading", "Pattern", "ExtGState", "ColorSpace", "Group", "SMask", "Mask", "CharProcs",
+})
+
+class _OutOfTime(Exception):
+    pass
+
+def _digest(obj, memo, deadline=None):
+    """Stable SHA-256 of a pdfminer object, following references"""
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+
+    if isinstance(obj, PDFObjRef):
+        digest = memo.get(obj.objid)
+        if digest is None:
+            if deadline is not None and deadline.expired():
+                raise _OutOfTime
+            memo[obj.objid] = b"cycle"  # placeholder while resolving
+            digest = memo[obj.objid] = _digest(obj.resolve(), memo, deadline)
+        return digest
+
+    h = hashlib.sha256()
+    if isinstance(obj, PDFStream):
+        raw = obj.get_rawdata()
+        h.update(b"stream")
+        h.update(_digest(obj.attrs, memo, deadline))
+        h.update(raw if raw is not None else obj.get_data())
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj, key=str):
+            if key not in _FINGERPRINT_SKIP:
+                h.update(str(key).encode("utf-8"))
+                h.update(_digest(obj[key], memo, deadline))
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"list")
+        if any(isinstance(item, (PDFObjRef, PDFStream, dict, list, tuple)) for item in obj):
+            for item in obj:
+                h.update(_digest(item, memo, deadline))
+        else:
+            h.update(repr(obj).encode("utf-8"))  # flat arrays (widths, encodings) in one go
+    else:
+        h.update(repr(obj).encode("utf-8"))
+    return h.digest()
+
+def pdf_page_fingerprints(data, max_pages=MAX_PAGES, deadline=None):
+    """
+    Hex fingerprint of each of the first `max_pages` pages, in page order.
+    With a `deadline`, stops once it has passed (checked before each object
+    is resolved) and marks it cut_short: the pages after that count as unread.
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    document = PDFDocument(PDFParser(io.BytesIO(data)))
+    memo = {}  # fonts and images shared between pages are hashed once
+    fingerprints = []
+    for page in islice(PDFPage.create_pages(document), max_pages):
+        try:
+            fingerprints.append(_digest(page.attrs, memo, deadline).hex())
+        except _OutOfTime:
+            deadline.cut_short = True
+            break
+    return fingerprints
+
+def _extract_page_list(data, page_numbers, backend, deadline=None):
+    """
+    Worker: raw text of the given pages (0-based, ascending) with one PDF
+    backend. Stops between pages once `deadline` passes, so the list can be
+    shorter than `page_numbers`.
+    """
+    return [text for _, text in _iter_page_list(data, page_numbers, backend, deadline)]
+
+def _iter_page_list(data, page_numbers, backend, deadline):
+    if backend == "pdfminer":
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        layouts = extract_pages(io.BytesIO(data), page_numbers=set(page_numbers))
+        for n in page_numbers:
+            if deadline is not None and deadline.expired():
+                return
+            layout = next(layouts)  # pages are parsed as the generator advances
+            yield n, "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+        return
+
+    import pdfplumber
+
+    layout = backend == "pdfplumber-layout"
+    with pdfplumber.open(io.BytesIO(data), pages=[n + 1 for n in page_numbers]) as pdf:
+        for n, page in zip(page_numbers, pdf.pages):
+            if deadline is not None and deadline.expired():
+                return
+            yield n, page.extract_text(layout=layout) or ""
+
+def iter_pdf_page_texts(data, page_numbers, backend, deadline=None, workers=None):
+    """
+    Yield (page index, raw text) for just the given pages with one of the
+    PDF_BACKENDS, in page order.
+
+    Pages are read in the process pool, PAGES_PER_CHUNK at a time, so the
+    deadline (a fresh TIME_BUDGET one when None) holds even for a single
+    pathological page: workers stop between pages once it passes, and one
+    still busy STUCK_GRACE seconds later is killed. Either way the
+    generator stops early and marks the deadline cut_short.
+    """
+    page_numbers = sorted(page_numbers)
+    if not page_numbers:
+        return
+    deadline = deadline or Deadline()
+    chunks = [page_numbers[i:i + PAGES_PER_CHUNK] for i in range(0, len(page_numbers), PAGES_PER_CHUNK)]
+    yield from _read_chunks(data, chunks, backend, deadline, workers)
+
+def _read_chunks(data, chunks, backend, deadline, workers, retried=False):
+    executor = get_executor(workers)
+    futures = [executor.submit(_extract_page_list, data, chunk, backend, deadline) for chunk in chunks]
+    try:
+        for i, (chunk, future) in enumerate(zip(chunks, futures)):
+            if deadline.expired() and future.cancel():
+                deadline.cut_short = True  # never started
+                return
+            try:
+                texts = future.result(timeout=deadline.remaining() + STUCK_GRACE)
+            except FutureTimeout:
+                deadline.cut_short = True
+                if not future.cancel():
+                    _discard_executor(executor)  # stuck inside one page
+                return
+            except BrokenProcessPool:
+                # Another document's stuck page took the pool down: once, on a fresh pool
+                if retried:
+                    raise
+                yield from _read_chunks(data, chunks[i:], backend, deadline, workers, retried=True)
+                return
+            yield from zip(chunk, texts)
+            if len(texts) < len(chunk):
+                deadline.cut_short = True  # the worker ran out of time part way
+                return
+    finally:
+        # Drop whatever has not started yet (budget hit or consumer stopped early)
+        for future in futures:
+            future.cancel()
+
+# ================= DOCX =================
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Bullet and dash glyphs replaced by a space as the text is read
+BULLETS = str.maketrans(dict.fromkeys("•▪●◦–—", " "))
+
+# Table rows come out as one line, cells separated like "Skills | Python, SQL"
+# (the section segmenter reads "|" as a heading separator)
+CELL_SEPARATOR = " | "
+
+def _docx_row(cells):
+    return CELL_SEPARATOR.join(cell for cell in cells if cell)
+
+def _docx_cell(paragraphs):
+    return " ".join(p.strip() for p in paragraphs if p.strip())
+
+def _python_docx_blocks(parent):
+    from docx.table import Table, _Cell
+
+    for block in parent.iter_inner_content():
+        if not isinstance(block, Table):
+            yield block.text
+            continue
+        for row in block.rows:
+            # The row's own cells, as in document.xml: row.cells repeats a
+            # merged cell, and a vertical merge's top cell in every row below
+            cells = [_docx_cell(_python_docx_blocks(_Cell(tc, block))) for tc in row._tr.tc_lst]
+            yield _docx_row(cells)
+
+def extract_docx_text_python_docx(data):
+    """Paragraph and table text through the full python-docx object model"""
+    import docx
+
+    doc = docx.Document(io.BytesIO(data))
+    return "\n".join(_python_docx_blocks(doc)).translate(BULLETS)
+
+# Text of the other run content elements, the way python-docx reads them
+# (a page or column break is no line break)
+RUN_CONTENT = {
+    W_NS + "tab": lambda elem: "\t",
+    W_NS + "ptab": lambda elem: "\t",
+    W_NS + "cr": lambda elem: "\n",
+    W_NS + "br": lambda elem: "\n" if elem.get(W_NS + "type", "textWrapping") == "textWrapping" else "",
+    W_NS + "noBreakHyphen": lambda elem: "-",
+}
+
+# The elements python-docx reads text from, by parent: only these direct
+# children. Anything else (text boxes, w:sdt and w:ins wrappers, fields) is
+# skipped with everything inside it, as python-docx skips it
+DOCX_TEXT_CHILDREN = {
+    "": {W_NS + "document"},
+    W_NS + "document": {W_NS + "body"},
+    W_NS + "body": {W_NS + "p", W_NS + "tbl"},
+    W_NS + "tbl": {W_NS + "tr"},
+    W_NS + "tr": {W_NS + "tc"},
+    W_NS + "tc": {W_NS + "p", W_NS + "tbl"},
+    W_NS + "p": {W_NS + "r", W_NS + "hyperlink"},
+    W_NS + "hyperlink": {W_NS + "r"},
+    W_NS + "r": {W_NS + "t", *RUN_CONTENT},
+}
+
+def _drop_read(body):
+    # The parser keeps its own references to elements still open, so this
+    # only frees what has been read
+    if body is not None:
+        body.clear()
+
+def iter_docx_blocks(xml):
+    """
+    Stream word/document.xml: yield each body paragraph, and each table row
+    as one line, in document order, with bullets already normalized.
+
+    Paragraphs inside a cell are joined into the cell text; nested tables
+    end up inside their outer cell, and a merged cell is read once, in the
+    row it starts in. Only the elements python-docx reads count (see
+    DOCX_TEXT_CHILDREN): a paragraph in a text box is not a block of its
+    own, nor part of the paragraph anchoring the box. Finished body-level elements are dropped from the
+    tree as soon as they are read, so memory stays flat however long the
+    document is.
+    """
+    runs = []           # text of the paragraph being read
+    cells = []          # stack of open table cells: their paragraphs so far
+    rows = []           # stack of open table rows: their finished cells
+    path = [""]         # open elements that are read; None inside a skipped one
+    body = None
+
+    for event, elem in ET.iterparse(xml, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            read = tag in DOCX_TEXT_CHILDREN.get(path[-1], ())
+            path.append(tag if read else None)
+            if not read:
+                continue
+            if tag == W_NS + "tc":
+                cells.append([])
+            elif tag == W_NS + "tr":
+                rows.append([])
+            elif tag == W_NS + "body":
+                body = elem
+            continue
+
+        if path.pop() is None:
+            continue
+        if tag == W_NS + "t":
+            runs.append((elem.text or "").translate(BULLETS))
+        elif tag in RUN_CONTENT:
+            runs.append(RUN_CONTENT[tag](elem))
+        elif tag == W_NS + "p":
+            text, runs = "".join(runs), []
+            if cells:
+                cells[-1].append(text)
+            else:
+                _drop_read(body)
+                yield text
+        elif tag == W_NS + "tc":
+            rows[-1].append(_docx_cell(cells.pop()))
+        elif tag == W_NS + "tr":
+            line = _docx_row(rows.pop())
+            if cells:
+                cells[-1].append(line)
+            else:
+                _drop_read(body)
+                yield line
+
+def extract_docx_text_xml(data):
+    """Paragraph and table text streamed from word/document.xml, no object model"""
+    with zipfile.ZipFile(io.BytesIO(data)) as zf, zf.open("word/document.xml") as xml:
+        return "\n".join(iter_docx_blocks(xml))
+
+# ================= BACKENDS & POLICY =================
+
+# PDF backends take an optional Deadline; DOCX ones have no time budget
+PDF_BACKENDS = {
+    "pdfminer": extract_pdf_text_pdfminer,
+    "pdfplumber": lambda data, deadline=None: extract_pdf_text(data, deadline=deadline, layout=False),
+    "pdfplumber-layout": lambda data, deadline=None: extract_pdf_text(data, deadline=deadline, layout=True),
+}
+
+DOCX_BACKENDS = {
+    "docx-xml": extract_docx_text_xml,
+    "python-docx": extract_docx_text_python_docx,
+}
+
+BACKENDS = {"pdf": PDF_BACKENDS, "docx": DOCX_BACKENDS}
+
+# Backends tried in order; the last one is the high-fidelity fallback
+EXTRACTION_POLICIES = {
+    "fast": {
+        "pdf": ["pdfminer", "pdfplumber-layout"],
+        "docx": ["docx-xml", "python-docx"],
+    },
+    "balanced": {
+        "pdf": ["pdfplumber", "pdfplumber-layout"],
+        "docx": ["docx-xml", "python-docx"],
+    },
+    "fidelity": {
+        "pdf": ["pdfplumber-layout"],
+        "docx": ["python-docx"],
+    },
+}
+
+DEFAULT_POLICY = "balanced"
+
+MIN_TEXT_CHARS = 50         # less than this is treated as a failed extraction
+MAX_CID_RATIO = 0.05        # share of characters allowed to be (cid:N) junk
+
+CID_PATTERN = re.compile(r"\(cid:\d+\)|\$cid:*\d+\$|\ufffd", re.IGNORECASE)
+
+def looks_degenerate(text):
+    """True when extracted text is too short or mostly unmapped glyphs"""
+    stripped = text.strip()
+    if len(stripped) < MIN_TEXT_CHARS:
+        return True
+    junk = sum(len(m) for m in CID_PATTERN.findall(stripped))
+    return junk / len(stripped) > MAX_CID_RATIO
+
+def extract_with_policy(data, kind, policy=DEFAULT_POLICY, deadline=None):
+    """
+    Run the backends of `policy` for `kind` ("pdf" / "docx") in order and
+    return (text, backend name) for the first non-degenerate result.
+    When every backend looks degenerate the last (highest fidelity) output wins.
+    PDF backends share one `deadline` (a fresh TIME_BUDGET one when None);
+    check its cut_short afterwards to see whether the text is complete.
+    """
+    names = EXTRACTION_POLICIES[policy][kind]
+    text, used, error = "", None, None
+    options = {"deadline": deadline or Deadline()} if kind == "pdf" else {}
+
+    for name in names:
+        try:
+            text, used = BACKENDS[kind][name](data, **options), name
+        except Exception as e:
+            error = e
+            continue
+        if not looks_degenerate(text):
+            break
+
+    if used is None:
+        raise error
+    return text, used
+